@@ -0,0 +1,38 @@
+"""Bulk notification jobs
+
+Revision ID: 5c2e9a7d41f3
+Revises: b41f6d2c8e90
+Create Date: 2026-10-18 10:03:17.552901
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c2e9a7d41f3'
+down_revision: Union[str, None] = 'b41f6d2c8e90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('notification_jobs',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('subject', sa.String(), nullable=False),
+    sa.Column('status', sa.Enum('RUNNING', 'FINISHED', 'CANCELLED', 'FAILED', name='notificationjobstatus'), nullable=False),
+    sa.Column('total', sa.Integer(), nullable=True),
+    sa.Column('sent', sa.Integer(), nullable=False),
+    sa.Column('failed', sa.Integer(), nullable=False),
+    sa.Column('failures', sa.JSON(none_as_null=True), nullable=False),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('notification_jobs')
+    sa.Enum(name='notificationjobstatus').drop(op.get_bind(), checkfirst=False)
@@ -0,0 +1,36 @@
+"""Resumable notification jobs
+
+Revision ID: a7c3e09d5b21
+Revises: f2d48c6a1e93
+Create Date: 2026-10-18 16:12:40.371205
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c3e09d5b21'
+down_revision: Union[str, None] = 'f2d48c6a1e93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('notification_jobs', sa.Column('body', sa.String(), nullable=True))
+    op.add_column('notification_jobs', sa.Column('event_id', sa.UUID(), nullable=True))
+    op.add_column('notification_jobs', sa.Column('attempts', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('notification_jobs', sa.Column('heartbeat_at', sa.DateTime(timezone=True), nullable=True))
+    op.create_foreign_key('notification_jobs_event_id_fkey', 'notification_jobs', 'events', ['event_id'], ['id'])
+    op.create_index('ix_notification_jobs_running', 'notification_jobs', ['heartbeat_at'], unique=False, postgresql_where=sa.text("status = 'RUNNING'"))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_notification_jobs_running', table_name='notification_jobs', postgresql_where=sa.text("status = 'RUNNING'"))
+    op.drop_constraint('notification_jobs_event_id_fkey', 'notification_jobs', type_='foreignkey')
+    op.drop_column('notification_jobs', 'heartbeat_at')
+    op.drop_column('notification_jobs', 'attempts')
+    op.drop_column('notification_jobs', 'event_id')
+    op.drop_column('notification_jobs', 'body')
@@ -0,0 +1,42 @@
+"""Transactional email outbox
+
+Revision ID: b41f6d2c8e90
+Revises: 7d3e6c2e181a
+Create Date: 2026-10-18 09:12:44.318205
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b41f6d2c8e90'
+down_revision: Union[str, None] = '7d3e6c2e181a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('outbox',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('subject', sa.String(), nullable=False),
+    sa.Column('recipients', sa.JSON(none_as_null=True), nullable=False),
+    sa.Column('body', sa.String(), nullable=False),
+    sa.Column('html', sa.Boolean(), nullable=False),
+    sa.Column('status', sa.Enum('PENDING', 'SENT', 'FAILED', name='outboxstatus'), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('next_attempt_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('last_error', sa.String(), nullable=True),
+    sa.Column('sent_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_outbox_pending', 'outbox', ['next_attempt_at'], unique=False, postgresql_where=sa.text("status = 'PENDING'"))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_outbox_pending', table_name='outbox', postgresql_where=sa.text("status = 'PENDING'"))
+    op.drop_table('outbox')
+    sa.Enum(name='outboxstatus').drop(op.get_bind(), checkfirst=False)
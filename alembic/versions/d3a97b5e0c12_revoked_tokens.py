@@ -0,0 +1,35 @@
+"""Revoked access tokens
+
+Revision ID: d3a97b5e0c12
+Revises: c8f2a61d9b47
+Create Date: 2026-10-18 12:20:41.882036
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3a97b5e0c12'
+down_revision: Union[str, None] = 'c8f2a61d9b47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('revoked_tokens',
+    sa.Column('jti', sa.String(), nullable=False),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('jti')
+    )
+    op.create_index('ix_revoked_tokens_created_at', 'revoked_tokens', ['created_at'], unique=False)
+    op.create_index(op.f('ix_revoked_tokens_expires_at'), 'revoked_tokens', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_revoked_tokens_expires_at'), table_name='revoked_tokens')
+    op.drop_index('ix_revoked_tokens_created_at', table_name='revoked_tokens')
+    op.drop_table('revoked_tokens')
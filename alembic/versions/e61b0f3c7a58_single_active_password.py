@@ -0,0 +1,35 @@
+"""Single active password per user
+
+Revision ID: e61b0f3c7a58
+Revises: d3a97b5e0c12
+Create Date: 2026-10-18 13:05:12.640193
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e61b0f3c7a58'
+down_revision: Union[str, None] = 'd3a97b5e0c12'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # password changes used to keep every previous hash active, the newest one wins
+    op.execute("""
+        UPDATE passwords SET active = false
+        WHERE active AND id NOT IN (
+            SELECT DISTINCT ON (user_id) id FROM passwords
+            WHERE active
+            ORDER BY user_id, created_at DESC
+        )
+    """)
+    op.create_index('ix_passwords_active', 'passwords', ['user_id'], unique=True, postgresql_where=sa.text('active'))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_passwords_active', table_name='passwords', postgresql_where=sa.text('active'))
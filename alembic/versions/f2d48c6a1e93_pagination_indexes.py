@@ -0,0 +1,32 @@
+"""Keyset pagination indexes
+
+Revision ID: f2d48c6a1e93
+Revises: e61b0f3c7a58
+Create Date: 2026-10-18 14:31:57.108442
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2d48c6a1e93'
+down_revision: Union[str, None] = 'e61b0f3c7a58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_events_active_page', 'events', ['start_date', 'id'], unique=False, postgresql_where=sa.text('active'))
+    op.create_index('ix_users_active_page', 'users', ['created_at', 'id'], unique=False, postgresql_where=sa.text('active'))
+    op.create_index('ix_assistants_page', 'assistants', ['created_at', 'id'], unique=False)
+    op.create_index('ix_sessions_event_page', 'sessions', ['event_id', 'start_date', 'id'], unique=False, postgresql_where=sa.text('active'))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_sessions_event_page', table_name='sessions', postgresql_where=sa.text('active'))
+    op.drop_index('ix_assistants_page', table_name='assistants')
+    op.drop_index('ix_users_active_page', table_name='users', postgresql_where=sa.text('active'))
+    op.drop_index('ix_events_active_page', table_name='events', postgresql_where=sa.text('active'))
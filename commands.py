@@ -1,10 +1,64 @@
+import os
+import shutil
 import subprocess
+import sys
+import tempfile
 
 def dev():
     subprocess.call(["fastapi", "dev", "tus_datos_prueba"])
 
+def serve():
+    """
+    Production server, one worker per CPU by default (WEB_CONCURRENCY).
+    SIGHUP restarts the workers one by one, SIGTERM waits for in-flight requests.
+    """
+    # the app must not be imported here, workers import it once the metrics directory exists
+    import uvicorn
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    env = os.environ
+
+    # workers write their metrics here and /metrics aggregates them,
+    # values left by a previous run must not be mixed in
+    metrics_dir = env.setdefault("PROMETHEUS_MULTIPROC_DIR", os.path.join(tempfile.gettempdir(), "tus_datos_prueba_metrics"))
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+    os.makedirs(metrics_dir)
+
+    uvicorn.run(
+        "tus_datos_prueba:app",
+        host=env.get("SERVER_HOST", "0.0.0.0"),
+        port=int(env.get("SERVER_PORT", "8000")),
+        workers=int(env.get("WEB_CONCURRENCY", str(os.cpu_count() or 1))),
+        # uvloop and httptools when installed
+        loop="auto",
+        http="auto",
+        proxy_headers=True,
+        forwarded_allow_ips=env.get("FORWARDED_ALLOW_IPS", "127.0.0.1"),
+        timeout_graceful_shutdown=int(env.get("GRACEFUL_SHUTDOWN_TIMEOUT", "30")),
+    )
+
+def reindex_events():
+    """
+    Rebuild the events search index from Postgres, searches switch to it with no downtime
+    """
+    import asyncio
+    from tus_datos_prueba.utils.elastic import open_elastic, close_elastic
+    from tus_datos_prueba.utils.elastic.events_index import reindex_events as reindex
+
+    async def run():
+        try:
+            await reindex(open_elastic())
+        finally:
+            await close_elastic()
+
+    asyncio.run(run())
+
 def alembic_migrate():
     subprocess.call(["alembic", "upgrade", "head"])
 
 def alembic_autogen():
-    subprocess.call(["alembic", "revision", "--autogenerate"])
\ No newline at end of file
+    subprocess.call(["alembic", "revision", "--autogenerate"])
+
+if __name__ == "__main__":
+    globals()[sys.argv[1]]()
@@ -1,3 +1,4 @@
+import os
 from fastapi import FastAPI
 from tus_datos_prueba.app.routes.ping import router as ping_router
 from tus_datos_prueba.app.routes.users import router as users_router
@@ -6,7 +7,22 @@ from tus_datos_prueba.app.middlewares.timing import timing as timing_middleware
 from tus_datos_prueba.app.middlewares.log import log as log_middleware
 from tus_datos_prueba.app.middlewares.errors import assertion_error, on_error
 from prometheus_fastapi_instrumentator import Instrumentator
-from tus_datos_prueba.app.metrics.db_status import db_server_time, db_table_count
+from prometheus_client import multiprocess
+from tus_datos_prueba.app.metrics.db_status import probe_db_server, sample_table_count
+from tus_datos_prueba.app.metrics.elastic_status import sample_elastic_pool
+from tus_datos_prueba.app.workers.outbox import deliver_outbox
+from tus_datos_prueba.app.workers.notifications import resume_notification_jobs
+from tus_datos_prueba.utils.elastic import open_elastic, close_elastic
+from tus_datos_prueba.utils.elastic.events_index import ensure_events_template
+from tus_datos_prueba.utils.elastic.shipper import LOG_SHIPPER
+from tus_datos_prueba.utils.mail import get_pool as get_mail_pool
+from tus_datos_prueba.utils.password import close_executor as close_password_executor
+from tus_datos_prueba.utils.db.notify import run_listener
+from tus_datos_prueba.utils.db.replicas import has_replicas, probe_replicas
+from tus_datos_prueba.utils.jwt.perms import refresh_registry
+from tus_datos_prueba.utils.jwt.revocations import refresh_revocations
+from tus_datos_prueba.utils.tasks import every, spawn, cancel_all
+from tus_datos_prueba.config import DB_METRICS_INTERVAL, DB_PROBE_INTERVAL, DB_REPLICA_LAG_INTERVAL, ELASTIC_METRICS_INTERVAL, LOG_SPOOL_REPLAY_INTERVAL, MAIL_POOL_IDLE_TIMEOUT, NOTIFY_JOB_POLL_INTERVAL, OUTBOX_POLL_INTERVAL, PERMISSION_REFRESH_INTERVAL, REVOCATION_REFRESH_INTERVAL, TOKEN_FORMAT
 
 app = FastAPI(
     name="TusDatosPrueba",
@@ -14,17 +30,45 @@ app = FastAPI(
     redoc_url=None,
 )
 
-instrumentator = (
-    Instrumentator()
-    .instrument(app)
-    .add(db_server_time())
-    .add(db_table_count())
-)
+instrumentator = Instrumentator().instrument(app)
 
 
 @app.on_event("startup")
 async def _startup():
     instrumentator.expose(app, include_in_schema=False)
+    open_elastic()
+    LOG_SHIPPER.start()
+    spawn(get_mail_pool().fill(), "smtp_pool_fill")
+    spawn(run_listener(), "pg_listener")
+    spawn(ensure_events_template(open_elastic()), "events_template")
+
+    every(OUTBOX_POLL_INTERVAL, deliver_outbox, "outbox")
+    every(NOTIFY_JOB_POLL_INTERVAL, resume_notification_jobs, "notification_jobs")
+    every(MAIL_POOL_IDLE_TIMEOUT / 2, get_mail_pool().reap, "smtp_pool_reap")
+    every(LOG_SPOOL_REPLAY_INTERVAL, LOG_SHIPPER.replay, "log_spool_replay")
+    every(ELASTIC_METRICS_INTERVAL, sample_elastic_pool, "elastic_pool")
+    every(DB_PROBE_INTERVAL, probe_db_server, "db_probe")
+    every(DB_METRICS_INTERVAL, sample_table_count, "db_table_count")
+    every(REVOCATION_REFRESH_INTERVAL, refresh_revocations, "token_revocations")
+
+    if has_replicas():
+        every(DB_REPLICA_LAG_INTERVAL, probe_replicas, "db_replica_lag")
+
+    if TOKEN_FORMAT == "compact":
+        every(PERMISSION_REFRESH_INTERVAL, refresh_registry, "permission_registry")
+
+
+@app.on_event("shutdown")
+async def _shutdown():
+    await cancel_all()
+    await LOG_SHIPPER.close()
+    await get_mail_pool().close()
+    await close_elastic()
+    close_password_executor()
+
+    # live gauges of this worker stop being aggregated
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        multiprocess.mark_process_dead(os.getpid())
 
 
 app.middleware("http")(timing_middleware)
@@ -2,13 +2,14 @@ import re
 
 from tus_datos_prueba.app.services.assistants import AssistantService
 from tus_datos_prueba.app.models.assistants import AssistantResponse
-from tus_datos_prueba.utils.mail.compose import compose_email
+from tus_datos_prueba.app.models.pagination import Connection
+from tus_datos_prueba.app.services.outbox import OutboxService
 from tus_datos_prueba.app.services.events import EventService
 from tus_datos_prueba.app.services.users import UserService
 from tus_datos_prueba.models.events import AssistantType
 from tus_datos_prueba.utils.jwt import has_permission
+from tus_datos_prueba.config import PAGE_SIZE_DEFAULT, PAGE_SIZE_MAX
 from strawberry import type, mutation, field, Info
-from tus_datos_prueba.utils.mail import Mail
 from strawberry.scalars import JSON
 from uuid import UUID
 
@@ -26,6 +27,16 @@ class AssistantQueries:
         
         return [AssistantResponse.from_db(assistant) for assistant in assistants]
 
+    @field
+    async def assistant_connection(self, info: Info, first: int = PAGE_SIZE_DEFAULT, after: str | None = None) -> Connection[AssistantResponse]:
+        has_permission(info.context["session"], "assistants", "list")
+        assert 0 < first <= PAGE_SIZE_MAX, f"first must be between 1 and {PAGE_SIZE_MAX}."
+
+        svc: AssistantService = info.context["assistant_service"]
+
+        page = await svc.page_assistants(first, after)
+
+        return Connection.from_page(page, AssistantResponse.from_db)
 
     @field
     async def assistant_get_by_id(self, info: Info, id: UUID) -> AssistantResponse:
@@ -56,7 +67,7 @@ class AssistantMutations:
         svc: AssistantService = info.context["assistant_service"]
         svc_event: EventService = info.context["event_service"]
         svc_user: UserService = info.context["user_service"]
-        mail: Mail = info.context["mail"]
+        outbox: OutboxService = info.context["outbox_service"]
 
         # Validations...
         user_id = await svc_user.get_id_by_email(email)
@@ -72,14 +83,20 @@ class AssistantMutations:
             # Notify event creator
             event_title = await svc_event.get_event_title(event_id)
             event_creator_email = await svc_event.get_event_creator_email(event_id)
-            warning_message = compose_email(
+            await outbox.enqueue(
                 "Event is Full",
                 event_creator_email,
-                f"The event '{event_title}' has reached its maximum capacity. No more assistants can be added."
+                f"The event '{event_title}' has reached its maximum capacity. No more assistants can be added.",
+                commit=True
             )
-            await mail.send_message(warning_message)
             raise ValueError("Event is full")
 
+        await outbox.enqueue(
+            "Welcome to the Service",
+            email,
+            f"Welcome {full_name}, you have been registered as an assistant."
+        )
+
         await svc.create_assistant(
             event_id=event_id,
             email=email,
@@ -90,13 +107,6 @@ class AssistantMutations:
             contact_meta=contact_metadata
         )
 
-        message = compose_email(
-            "Welcome to the Service",
-            email,
-            f"Welcome {full_name}, you have been registered as an assistant."
-        )
-        await mail.send_message(message)
-
         return "Assistant created successfully"
 
     @mutation
@@ -128,27 +138,25 @@ class AssistantMutations:
 
         svc: AssistantService = info.context["assistant_service"]
         svc_event: EventService = info.context["event_service"]
-        mail: Mail = info.context["mail"]
+        outbox: OutboxService = info.context["outbox_service"]
 
         assistant = await svc.get_by_id(id)
         assert assistant is not None
 
         # Notify event creator
         event_creator_email = await svc_event.get_event_creator_email(assistant.event_id)
-        creator_message = compose_email(
+        await outbox.enqueue(
             "Assistant Removed",
             event_creator_email,
             f"The assistant {assistant.full_name} ({assistant.email}) has been removed from the event."
         )
-        await mail.send_message(creator_message)
 
         # Notify the removed assistant
-        assistant_message = compose_email(
+        await outbox.enqueue(
             "You Have Been Removed",
             assistant.email,
             f"You have been removed from the event with ID {assistant.event_id}."
         )
-        await mail.send_message(assistant_message)
 
         await svc.delete(assistant)
         return None
\ No newline at end of file
@@ -1,16 +1,35 @@
 from datetime import datetime
 from tus_datos_prueba.app.services.events import EventService, SearchEventService
 from tus_datos_prueba.app.services.users import UserService
-from tus_datos_prueba.app.models.events import EventResponse
-from tus_datos_prueba.utils.mail.compose import compose_email
+from tus_datos_prueba.app.services.outbox import OutboxService
+from tus_datos_prueba.app.models.events import EVENT_SOURCE_FIELDS, EventResponse, SearchFreshness
+from tus_datos_prueba.app.models.pagination import Connection
 from tus_datos_prueba.models.events import EventStatus
 from tus_datos_prueba.utils.jwt import has_permission
+from tus_datos_prueba.utils.db.pagination import Page
+from tus_datos_prueba.config import PAGE_SIZE_DEFAULT, PAGE_SIZE_MAX
 from strawberry import type, mutation, field, Info
-from tus_datos_prueba.utils.mail import Mail
+from strawberry.types.nodes import Selection, SelectedField
 from strawberry.scalars import JSON
 from uuid import UUID
 
 
+def _selected_fields(selections: list[Selection], *path: str) -> set[str]:
+    """
+    Names of the fields selected under `path`, fragments included
+    """
+    names = set()
+    for selection in selections:
+        if not isinstance(selection, SelectedField):
+            # inline fragments and fragment spreads
+            names |= _selected_fields(selection.selections, *path)
+        elif not path:
+            names.add(selection.name)
+        elif selection.name == path[0]:
+            names |= _selected_fields(selection.selections, *path[1:])
+    return names
+
+
 @type
 class EventQueries:
     @field
@@ -23,6 +42,16 @@ class EventQueries:
         
         return [EventResponse.from_db(event) for event in events]
 
+    @field
+    async def event_connection(self, info: Info, first: int = PAGE_SIZE_DEFAULT, after: str | None = None) -> Connection[EventResponse]:
+        has_permission(info.context["session"], "events", "list")
+        assert 0 < first <= PAGE_SIZE_MAX, f"first must be between 1 and {PAGE_SIZE_MAX}."
+
+        svc: EventService = info.context["event_service"]
+
+        page = await svc.page_events(first, after)
+
+        return Connection.from_page(page, EventResponse.from_db)
 
     @field
     async def event_get_by_id(self, info: Info, id: UUID) -> EventResponse:
@@ -44,9 +73,13 @@ class EventQueries:
         start_date: tuple[str, str] | None = None,
         assistant_count: tuple[int, int] | None = None,
         location: str | None = None,
-        category: str | None = None
-    ) -> list[EventResponse]:
+        category: str | None = None,
+        size: int = PAGE_SIZE_DEFAULT,
+        search_after: str | None = None,
+        freshness: SearchFreshness = SearchFreshness.EXACT
+    ) -> Connection[EventResponse]:
         has_permission(info.context["session"], "events", "list")
+        assert 0 < size <= PAGE_SIZE_MAX, f"size must be between 1 and {PAGE_SIZE_MAX}."
 
         svc: EventService = info.context["event_service"]
         svc_search: SearchEventService = info.context["search_event_service"]
@@ -69,12 +102,34 @@ class EventQueries:
             props['category'] = category
 
 
-        result = await svc_search.search(search, props)
-        
-        events = [await svc.get_by_id(id) for id in result]
-        events = [EventResponse.from_db(event) for event in events]
+        if freshness == SearchFreshness.FAST:
+            # answered from the index alone, fetching only the fields the query asks for
+            requested = _selected_fields(info.selected_fields[0].selections, "edges", "node")
+            source = sorted({"id"} | {EVENT_SOURCE_FIELDS[name] for name in requested if name in EVENT_SOURCE_FIELDS})
+
+            documents = await svc_search.search(search, props, size, search_after, source)
+            return Connection.from_page(documents, EventResponse.from_source)
+
+        hits = await svc_search.search(search, props, size, search_after)
+        cursors = dict(zip(hits.items, hits.cursors))
+
+        # one query for every hit, events inactive since they were indexed are left out
+        events = await svc.get_by_ids(hits.items)
+
+        connection = Connection.from_page(
+            Page(
+                items=events,
+                cursors=[cursors[event.id] for event in events],
+                has_next=hits.has_next,
+                has_previous=hits.has_previous,
+                count=hits.count,
+            ),
+            EventResponse.from_db,
+        )
+        # the next page starts after the last hit, even if that one was left out
+        connection.page_info.end_cursor = hits.cursors[-1] if hits.cursors else None
 
-        return events
+        return connection
     
 
 @type
@@ -114,6 +169,15 @@ class EventMutations:
 
         user = UUID(info.context["session"]["sub"])
 
+        user_email = (await svc_users.get_by_id(user)).email
+
+        outbox: OutboxService = info.context["outbox_service"]
+        await outbox.enqueue(
+            "Event Created Successfully",
+            user_email,
+            f"Your event '{title}' has been created successfully. It is scheduled from {start_date} to {end_date}."
+        )
+
         await svc.create_event(
             title, 
             description, 
@@ -124,16 +188,6 @@ class EventMutations:
             user
         )
 
-        user_email = (await svc_users.get_by_id(user)).email
-        
-        mail: Mail = info.context["mail"]
-        message = compose_email(
-            "Event Created Successfully",
-            user_email,
-            f"Your event '{title}' has been created successfully. It is scheduled from {start_date} to {end_date}."
-        )
-        await mail.send_message(message)
-
         return "Event created successfully"
     
     @mutation
@@ -0,0 +1,19 @@
+from tus_datos_prueba.app.services.notifications import NotificationService
+from tus_datos_prueba.app.models.notifications import NotificationJobResponse
+from tus_datos_prueba.utils.jwt import has_permission
+from strawberry import type, field, Info
+from uuid import UUID
+
+
+@type
+class NotificationQueries:
+    @field
+    async def notification_job_get_by_id(self, info: Info, id: UUID) -> NotificationJobResponse:
+        has_permission(info.context["session"], "assistants", "get")
+
+        svc: NotificationService = info.context["notification_service"]
+
+        job = await svc.get_by_id(id)
+        assert job is not None
+
+        return NotificationJobResponse.from_db(job)
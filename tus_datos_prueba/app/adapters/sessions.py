@@ -4,16 +4,20 @@ from uuid import UUID
 from datetime import datetime
 from strawberry.scalars import JSON
 from tus_datos_prueba.utils.jwt import has_permission
+from tus_datos_prueba.config import PAGE_SIZE_DEFAULT, PAGE_SIZE_MAX
 
 from tus_datos_prueba.app.services.events import EventService
 from tus_datos_prueba.app.services.users import UserService
 from tus_datos_prueba.app.services.sessions import SessionService
 from tus_datos_prueba.app.services.assistants import AssistantService
-from tus_datos_prueba.utils.mail.compose import compose_email
-from tus_datos_prueba.utils.mail import Mail
+from tus_datos_prueba.app.services.outbox import OutboxService
+from tus_datos_prueba.app.services.notifications import NotificationService
+from tus_datos_prueba.app.workers.notifications import start_notification_job
 
 from tus_datos_prueba.models.events import EventStatus, AssistantType
 from tus_datos_prueba.app.models.sessions import SessionResponse
+from tus_datos_prueba.app.models.pagination import Connection
+from tus_datos_prueba.app.models.notifications import NotificationJobResponse
 
 @type
 class SessionQueries:
@@ -25,6 +29,15 @@ class SessionQueries:
         sessions = await svc.list_sessions(event_id, limit, offset)
         return [SessionResponse.from_db(s) for s in sessions]
 
+    @field
+    async def session_connection(self, info: Info, event_id: UUID, first: int = PAGE_SIZE_DEFAULT, after: Optional[str] = None) -> Connection[SessionResponse]:
+        has_permission(info.context["session"], "assistants", "list")
+        assert 0 < first <= PAGE_SIZE_MAX, f"first must be between 1 and {PAGE_SIZE_MAX}."
+
+        svc: SessionService = info.context["session_service"]
+        page = await svc.page_sessions(event_id, first, after)
+        return Connection.from_page(page, SessionResponse.from_db)
+
     @field
     async def session_get_by_id(self, info: Info, id: UUID) -> SessionResponse:
         has_permission(info.context["session"], "assistants", "get")
@@ -82,6 +95,16 @@ class SessionMutations:
 
         user = UUID(info.context["session"]["sub"])
 
+        # Send email to the creator, committed with the session
+        user_email = (await svc_users.get_by_id(user)).email
+
+        outbox: OutboxService = info.context["outbox_service"]
+        await outbox.enqueue(
+            "Session Created Successfully",
+            user_email,
+            f"A new session titled '{title}' has been created for your event '{event.title}'."
+        )
+
         # Create session after all validations
         await session_svc.create_session(
             event_id=event_id,
@@ -92,18 +115,6 @@ class SessionMutations:
             meta=meta,
             speaker_id=speaker_id
         )
-        
-
-        # Send email to the creator
-
-        user_email = (await svc_users.get_by_id(user)).email
-
-        message = compose_email(
-            "Session Created Successfully",
-            user_email,
-            f"A new session titled '{title}' has been created for your event '{event.title}'."
-        )
-        await Mail.send_message(message)
 
         return "Session created successfully."
 
@@ -187,12 +198,11 @@ class SessionMutations:
             speaker_id=new_speaker_id
         )
     @mutation
-    async def session_delete(self, info: Info, id: UUID) -> None:
+    async def session_delete(self, info: Info, id: UUID) -> NotificationJobResponse:
         has_permission(info.context["session"], "assistants", "delete")
 
         session_svc: SessionService = info.context["session_service"]
-        assistant_svc: AssistantService = info.context["assistant_service"]
-        mail: Mail = info.context["mail"]
+        notification_svc: NotificationService = info.context["notification_service"]
 
         session_obj = await session_svc.get_by_id(id)
         assert session_obj is not None, "Session does not exist or is inactive."
@@ -201,17 +211,17 @@ class SessionMutations:
         assert event.active, "Cannot delete sessions of an inactive event."
         assert event.status != EventStatus.FINISHED, "Cannot delete sessions of a finished event."
 
-        # Obtener los asistentes del evento
-        assistants = await assistant_svc.get_assistants_by_event_id(event.id)
+        subject = "Session Deleted"
+        body = f"The session '{session_obj.title}' for the event '{event.title}' has been deleted."
 
-        # Notificar a todos los asistentes
-        for assistant in assistants:
-            message = compose_email(
-                "Session Deleted",
-                assistant.email,
-                f"The session '{session_obj.title}' for the event '{event.title}' has been deleted."
-            )
-            await mail.send_message(message)
+        # El job se guarda junto con la eliminación de la sesión
+        job = await notification_svc.create_job(subject, body, event.id)
+        response = NotificationJobResponse.from_db(job)
 
         # Eliminar la sesión
-        await session_svc.delete_session(session_obj)
\ No newline at end of file
+        await session_svc.delete_session(session_obj)
+
+        # Notificar a todos los asistentes del evento en segundo plano
+        start_notification_job(response.id)
+
+        return response
\ No newline at end of file
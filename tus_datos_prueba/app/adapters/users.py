@@ -3,10 +3,10 @@ from tus_datos_prueba.utils.db import Session
 from tus_datos_prueba.app.services.users import UserService
 from tus_datos_prueba.app.services.roles import RoleService
 from tus_datos_prueba.app.models.users import UserResponse
-from tus_datos_prueba.utils.mail import Mail
-from tus_datos_prueba.utils.mail.compose import compose_email
+from tus_datos_prueba.app.models.pagination import Connection
+from tus_datos_prueba.app.services.outbox import OutboxService
 from tus_datos_prueba.utils.jwt import has_permission
-from tus_datos_prueba.config import ADMIN_DOMAIN
+from tus_datos_prueba.config import ADMIN_DOMAIN, PAGE_SIZE_DEFAULT, PAGE_SIZE_MAX
 from strawberry import type, mutation, field, Info
 from strawberry.scalars import JSON
 from uuid import UUID
@@ -38,6 +38,16 @@ class UserQueries:
         
         return [UserResponse.from_db(user) for user in users]
 
+    @field
+    async def user_connection(self, info: Info, first: int = PAGE_SIZE_DEFAULT, after: str | None = None) -> Connection[UserResponse]:
+        has_permission(info.context["session"], "user", "list")
+        assert 0 < first <= PAGE_SIZE_MAX, f"first must be between 1 and {PAGE_SIZE_MAX}."
+
+        svc: UserService = info.context["user_service"]
+
+        page = await svc.page_users(first, after)
+
+        return Connection.from_page(page, UserResponse.from_db)
 
     @field
     async def user_get_by_id(self, info: Info, id: UUID) -> UserResponse:
@@ -73,20 +83,20 @@ class UserMutations:
         #validate password
         validate_password(password)
 
+        # the welcome email is committed together with the user
+        outbox: OutboxService = info.context["outbox_service"]
+        await outbox.enqueue(
+            "Welcome to the Service",
+            email,
+            f"Welcome {metadata['full_name']}, your user was created."
+        )
+
         #create user
         await svc.create(email, password, claim_role_id, metadata)
 
         user = await svc.get_id_by_email(email)
         assert user is not None
 
-        mail: Mail = info.context["mail"]
-        message = compose_email(
-            "Welcome to the Service",
-            email,
-            f"Welcome {metadata['full_name']}, your user was created."
-        )
-        await mail.send_message(message)
-
         return str(user)
     
     @mutation
@@ -132,15 +142,13 @@ class UserMutations:
         user = await svc.get_by_id(id)
         assert user is not None
 
-        mail: Mail = info.context["mail"]
-        message = compose_email(
+        outbox: OutboxService = info.context["outbox_service"]
+        await outbox.enqueue(
             "Warning!! User was Deleted!",
             user.email,
             f"Your user has been deleted."
         )
 
-        await mail.send_message(message)        
-
         await svc.delete(user)
 
     @mutation
@@ -155,15 +163,13 @@ class UserMutations:
 
         validate_password(password)
 
-        mail: Mail = info.context["mail"]
-        message = compose_email(
+        outbox: OutboxService = info.context["outbox_service"]
+        await outbox.enqueue(
             "Warning!! Password was Changed!",
             user.email,
             f"Your password has been changed."
         )
 
-        await mail.send_message(message)
-
         await svc.change_password(user, password)
 
 
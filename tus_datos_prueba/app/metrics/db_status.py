@@ -1,37 +1,82 @@
 from tus_datos_prueba.utils.db import __CONN, AsyncSession
+from tus_datos_prueba.utils.db.stats import estimate_rows, estimate_true_fraction
 from tus_datos_prueba.models import User, Role, RolePerm, Event, Assistant, Session
-from typing import Callable
+from tus_datos_prueba.config import DB_TABLE_COUNT_EXACT, DB_TABLE_COUNT_ESTIMATE_ABOVE
 from sqlalchemy import select, func, INTEGER
-from prometheus_fastapi_instrumentator.metrics import Info
 from prometheus_client import Gauge
+from datetime import datetime, timezone
+import time
 
 # Definir métricas globales
-DB_SERVER_TIME_METRIC = Gauge("db_server_time", "Actual time of the server system")
-DB_TABLE_COUNT_METRIC = Gauge("db_table_count", "Count total rows per table", labelnames=('count', 'table'))
-
-def db_server_time() -> Callable[[Info], None]:
-    async def instrumentation(info: Info):
-        async with AsyncSession(__CONN) as session:
-            time = await session.scalar(select(func.now()))
-            DB_SERVER_TIME_METRIC.set(time.timestamp())
-    return instrumentation
-
-def db_table_count() -> Callable[[Info], None]:
-    async def instrumentation(info: Info):
-        try:
-            async with AsyncSession(__CONN) as session:
-                models = [User, Role, RolePerm, Event, Assistant, Session]
-                for model in models:
-                    count_clean = None
-                    count = await session.scalar(select(func.count(model.id)))
-                    if hasattr(model, 'active'):
-                        count_clean = await session.scalar(select(func.sum(func.cast(model.active, INTEGER))))
-
-                    if count_clean is not None:
-                        DB_TABLE_COUNT_METRIC.labels(count="dirty", table=model.__tablename__).set(count)
-                        DB_TABLE_COUNT_METRIC.labels(count="clean", table=model.__tablename__).set(count_clean)
-                    else:
-                        DB_TABLE_COUNT_METRIC.labels(count="clean", table=model.__tablename__).set(count)
-        except Exception as err:
-            print(err)
-    return instrumentation
+DB_SERVER_TIME_METRIC = Gauge("db_server_time", "Actual time of the server system", multiprocess_mode="livemostrecent")
+DB_CLOCK_SKEW_METRIC = Gauge("db_clock_skew_seconds", "Database clock minus application clock", multiprocess_mode="livemostrecent")
+DB_PROBE_LATENCY_METRIC = Gauge("db_probe_latency_seconds", "Round trip of the last database probe", multiprocess_mode="livemostrecent")
+DB_TABLE_COUNT_METRIC = Gauge("db_table_count", "Count total rows per table", labelnames=('count', 'table'), multiprocess_mode="livemostrecent")
+DB_TABLE_COUNT_ESTIMATED_METRIC = Gauge("db_table_count_estimated", "1 when db_table_count comes from planner statistics", labelnames=('table',), multiprocess_mode="livemostrecent")
+
+TABLE_COUNT_MODELS = [User, Role, RolePerm, Event, Assistant, Session]
+
+async def probe_db_server():
+    """
+    Refresh server time, clock skew and round trip gauges, runs from a background task
+    """
+    async with AsyncSession(__CONN) as session:
+        # checkout first, the gauge should only measure the query round trip
+        await session.connection()
+        start = time.perf_counter()
+        server_time = await session.scalar(select(func.clock_timestamp()))
+        latency = time.perf_counter() - start
+        local_time = datetime.now(tz=timezone.utc)
+
+    # the server read its clock around the middle of the round trip
+    skew = server_time.timestamp() - (local_time.timestamp() - latency / 2)
+
+    DB_SERVER_TIME_METRIC.set(server_time.timestamp())
+    DB_CLOCK_SKEW_METRIC.set(skew)
+    DB_PROBE_LATENCY_METRIC.set(latency)
+
+async def _estimated_table_count(session: AsyncSession, model) -> bool:
+    table = model.__tablename__
+
+    count = await estimate_rows(session, table)
+    if count is None or count < DB_TABLE_COUNT_ESTIMATE_ABOVE:
+        return False
+
+    count_clean = None
+    if hasattr(model, 'active'):
+        fraction = await estimate_true_fraction(session, table, 'active')
+        if fraction is None:
+            return False
+        count_clean = round(count * fraction)
+
+    if count_clean is not None:
+        DB_TABLE_COUNT_METRIC.labels(count="dirty", table=table).set(count)
+        DB_TABLE_COUNT_METRIC.labels(count="clean", table=table).set(count_clean)
+    else:
+        DB_TABLE_COUNT_METRIC.labels(count="clean", table=table).set(count)
+    DB_TABLE_COUNT_ESTIMATED_METRIC.labels(table=table).set(1)
+    return True
+
+async def _exact_table_count(session: AsyncSession, model):
+    count_clean = None
+    count = await session.scalar(select(func.count(model.id)))
+    if hasattr(model, 'active'):
+        count_clean = await session.scalar(select(func.sum(func.cast(model.active, INTEGER))))
+
+    if count_clean is not None:
+        DB_TABLE_COUNT_METRIC.labels(count="dirty", table=model.__tablename__).set(count)
+        DB_TABLE_COUNT_METRIC.labels(count="clean", table=model.__tablename__).set(count_clean)
+    else:
+        DB_TABLE_COUNT_METRIC.labels(count="clean", table=model.__tablename__).set(count)
+    DB_TABLE_COUNT_ESTIMATED_METRIC.labels(table=model.__tablename__).set(0)
+
+async def sample_table_count():
+    """
+    Refresh DB_TABLE_COUNT_METRIC, large tables use pg_class/pg_stats estimates
+    unless DB_TABLE_COUNT_EXACT is set. Runs from a background task, never per request.
+    """
+    async with AsyncSession(__CONN) as session:
+        for model in TABLE_COUNT_MODELS:
+            if not DB_TABLE_COUNT_EXACT and await _estimated_table_count(session, model):
+                continue
+            await _exact_table_count(session, model)
@@ -0,0 +1,32 @@
+from tus_datos_prueba.utils.elastic import open_elastic
+from tus_datos_prueba.config import ELASTIC_CONNECTIONS_PER_NODE
+from prometheus_client import Gauge
+
+ELASTIC_NODES_METRIC = Gauge("elastic_pool_nodes", "Elasticsearch nodes known by the client", labelnames=('state',), multiprocess_mode="livemax")
+ELASTIC_CONNECTIONS_METRIC = Gauge("elastic_pool_connections", "Elasticsearch HTTP connections per node", labelnames=('node', 'state'), multiprocess_mode="livesum")
+ELASTIC_CONNECTIONS_LIMIT_METRIC = Gauge("elastic_pool_connections_limit", "Maximum HTTP connections per Elasticsearch node", multiprocess_mode="livesum")
+
+async def sample_elastic_pool():
+    """
+    Refresh the pool gauges of the shared client, runs from a background task
+    """
+    pool = open_elastic().transport.node_pool
+
+    nodes = pool.all()
+    alive = getattr(pool, "_alive_nodes", None)
+    alive_count = len(alive) if alive is not None else len(nodes)
+    ELASTIC_NODES_METRIC.labels(state="alive").set(alive_count)
+    ELASTIC_NODES_METRIC.labels(state="dead").set(len(nodes) - alive_count)
+    ELASTIC_CONNECTIONS_LIMIT_METRIC.set(ELASTIC_CONNECTIONS_PER_NODE)
+
+    for node in nodes:
+        # aiohttp creates the session on the first request of each node
+        session = getattr(node, "session", None)
+        connector = getattr(session, "connector", None)
+        if connector is None:
+            continue
+
+        in_use = len(getattr(connector, "_acquired", ()))
+        idle = sum(len(conns) for conns in getattr(connector, "_conns", {}).values())
+        ELASTIC_CONNECTIONS_METRIC.labels(node=node.base_url, state="in_use").set(in_use)
+        ELASTIC_CONNECTIONS_METRIC.labels(node=node.base_url, state="idle").set(idle)
@@ -1,6 +1,6 @@
 from fastapi import Request, HTTPException
 from fastapi.responses import JSONResponse
-from tus_datos_prueba.utils.elastic import get_elastic
+from tus_datos_prueba.utils.elastic.shipper import LOG_SHIPPER
 from datetime import datetime
 import uuid
 import traceback
@@ -40,21 +40,15 @@ async def on_error(request: Request, exc: Exception):
     }
     
     try:
-        error_details["request"]["body"] = await request.body()
+        error_details["request"]["body"] = (await request.body()).decode("utf-8", errors="replace")
     except Exception:
         pass
     
     error_details["request"]["query_params"] = dict(request.query_params)
     
-    elastic = await get_elastic()
-    try:
-        elastic.index(
-            index="http_errors",
-            body=error_details,
-            id=error_id
-        )
-    except Exception as es_exc:
-        print(f"Failed to log error to Elasticsearch: {es_exc}")
+    # queued (or spooled when the queue is full), the spool keeps it if Elasticsearch is down
+    if not LOG_SHIPPER.ship("http_errors", error_details, id=error_id):
+        print(f"Failed to queue error {error_id}")
         print(f"Original error details: {error_details}")
     
     return JSONResponse(
@@ -1,5 +1,5 @@
 from fastapi import Request, Response
-from tus_datos_prueba.utils.elastic import get_elastic
+from tus_datos_prueba.utils.elastic.shipper import LOG_SHIPPER
 import asyncio
 
 async def log(request: Request, call_next):
@@ -12,9 +12,7 @@ async def log(request: Request, call_next):
         response_length = int(response.headers.get('content-length', 0))
     client_ip = request.client.host
 
-    elastic = await get_elastic()
-
-    loop.create_task(elastic.index(index="http_logs", document={
+    LOG_SHIPPER.ship("http_logs", {
         "path": request.url.path,
         "method": request.method,
         "client_ip": client_ip,
@@ -23,7 +21,7 @@ async def log(request: Request, call_next):
         "status_code": response.status_code,
         "response_length": response_length,
         "timestamp": loop.time(),
-    }))
+    })
 
     return response
 
@@ -1,8 +1,30 @@
-from strawberry import type
+from enum import Enum
+from strawberry import enum, type
 from strawberry.scalars import JSON
 from tus_datos_prueba.models import Event
+from tus_datos_prueba.models.events import EventStatus
 from uuid import UUID
 
+@enum
+class SearchFreshness(Enum):
+    # straight from the search index, may lag Postgres by the indexing schedule
+    FAST = "fast"
+    # hits are reloaded from Postgres
+    EXACT = "exact"
+
+
+# GraphQL field -> indexed document field
+EVENT_SOURCE_FIELDS = {
+    "id": "id",
+    "title": "title",
+    "description": "description",
+    "startDate": "start_date",
+    "endDate": "end_date",
+    "status": "status",
+    "owner": "created_by_id",
+}
+
+
 @type
 class EventResponse:
     id: UUID
@@ -23,4 +45,18 @@ class EventResponse:
             end_date=event.end_date,
             status=event.status,
             owner=event.created_by_id
-        )
\ No newline at end of file
+        )
+
+    @staticmethod
+    def from_source(document: dict):
+        # only the requested fields were fetched, the rest are never resolved
+        return EventResponse(
+            id=UUID(document["id"]),
+            title=document.get("title"),
+            description=document.get("description"),
+            start_date=document.get("start_date"),
+            end_date=document.get("end_date"),
+            # indexed as the enum name, as postgres stores it
+            status=EventStatus[document["status"]] if "status" in document else None,
+            owner=document.get("created_by_id")
+        )
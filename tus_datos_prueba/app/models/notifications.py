@@ -0,0 +1,25 @@
+from strawberry import type
+from strawberry.scalars import JSON
+from tus_datos_prueba.models import NotificationJob
+from uuid import UUID
+
+
+@type
+class NotificationJobResponse:
+    id: UUID
+    status: int
+    total: int | None
+    sent: int
+    failed: int
+    failures: JSON
+
+    @staticmethod
+    def from_db(job: NotificationJob):
+        return NotificationJobResponse(
+            id=job.id,
+            status=job.status,
+            total=job.total,
+            sent=job.sent,
+            failed=job.failed,
+            failures=job.failures
+        )
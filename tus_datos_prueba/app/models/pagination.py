@@ -0,0 +1,57 @@
+from typing import Awaitable, Callable, Generic, TypeVar
+from strawberry import enum, field, type, Private
+from tus_datos_prueba.utils.db.pagination import Count, CountMode, Page
+
+T = TypeVar("T")
+
+TotalCountMode = enum(CountMode, name="TotalCountMode")
+
+
+@type
+class PageInfo:
+    has_next_page: bool
+    has_previous_page: bool
+    start_cursor: str | None
+    end_cursor: str | None
+
+
+@type
+class TotalCount:
+    value: int
+    mode: TotalCountMode
+
+
+@type
+class Edge(Generic[T]):
+    node: T
+    cursor: str
+
+
+@type
+class Connection(Generic[T]):
+    edges: list[Edge[T]]
+    page_info: PageInfo
+    counter: Private[Callable[[bool], Awaitable[Count]] | None] = None
+
+    @field
+    async def total_count(self, exact: bool = False) -> TotalCount | None:
+        """
+        Rows of the whole list, estimated unless `exact` (exact counts are capped)
+        """
+        if self.counter is None:
+            return None
+        count = await self.counter(exact)
+        return TotalCount(value=count.value, mode=count.mode)
+
+    @staticmethod
+    def from_page(page: Page, convert: Callable) -> "Connection":
+        return Connection(
+            edges=[Edge(node=convert(item), cursor=cursor) for item, cursor in zip(page.items, page.cursors)],
+            page_info=PageInfo(
+                has_next_page=page.has_next,
+                has_previous_page=page.has_previous,
+                start_cursor=page.cursors[0] if page.cursors else None,
+                end_cursor=page.cursors[-1] if page.cursors else None,
+            ),
+            counter=page.count,
+        )
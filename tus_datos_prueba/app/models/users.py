@@ -11,6 +11,17 @@ class LoginClaim(BaseModel):
     password: str
 
 
+class RefreshClaim(BaseModel):
+    refresh_token: str
+
+
+class TokenPair(BaseModel):
+    access_token: str
+    refresh_token: str
+    token_type: str = "bearer"
+    expires_in: int
+
+
 @type
 class UserResponse:
     id: UUID
@@ -1,25 +1,34 @@
+from typing import Any, Callable
 from strawberry import field, Schema, type
-from strawberry.fastapi import GraphQLRouter
+from strawberry.extensions import SchemaExtension
+from strawberry.fastapi import GraphQLRouter, BaseContext
+from strawberry.types.graphql import OperationType
 
 from tus_datos_prueba.app.adapters.assistants import AssistantMutations, AssistantQueries
 from tus_datos_prueba.app.adapters.events import EventMutations, EventQueries
 from tus_datos_prueba.app.adapters.sessions import SessionMutations, SessionQueries
 from tus_datos_prueba.app.adapters.users import UserMutations, UserQueries
+from tus_datos_prueba.app.adapters.notifications import NotificationQueries
 
 from tus_datos_prueba.app.services.assistants import AssistantService
 from tus_datos_prueba.app.services.events import EventService, SearchEventService
+from tus_datos_prueba.app.services.outbox import OutboxService
+from tus_datos_prueba.app.services.notifications import NotificationService
 from tus_datos_prueba.app.services.roles import RoleService
 from tus_datos_prueba.app.services.sessions import SessionService
 from tus_datos_prueba.app.services.users import UserService
 
-from tus_datos_prueba.utils.db import Session
-from tus_datos_prueba.utils.elastic import Elastic
+from tus_datos_prueba.utils.db import new_session
+from tus_datos_prueba.utils.db.notify import notify
+from tus_datos_prueba.utils.db.replicas import STICKY, STICKY_CHANNEL, has_replicas, is_sticky
+from tus_datos_prueba.utils.elastic import open_elastic
+from tus_datos_prueba.utils.jwt import UserPayload
 from tus_datos_prueba.utils.jwt.auth import UserSession
-from tus_datos_prueba.utils.mail import Mail
+from tus_datos_prueba.utils.mail import MailClient, get_pool
 
 
 @type
-class Queries(UserQueries, EventQueries, AssistantQueries, SessionQueries):
+class Queries(UserQueries, EventQueries, AssistantQueries, SessionQueries, NotificationQueries):
     @field
     def ping() -> str:
         return "pong"
@@ -30,18 +39,78 @@ class Mutations(UserMutations, EventMutations, AssistantMutations, SessionMutati
     pass
 
 
-async def get_context(user: UserSession, elastic: Elastic, mail: Mail, session: Session):
-    return {
-        "session": user,
-        "mail": mail,
-        "user_service": UserService(session),
-        "event_service": EventService(session),
-        "search_event_service": SearchEventService(elastic),
-        "role_service": RoleService(session),
-        "assistant_service": AssistantService(session),
-        "session_service": SessionService(session),
-    }
+class GraphQLContext(BaseContext):
+    """
+    Resolvers read `info.context[key]` as before, but every dependency
+    is only built the first time a resolver asks for it.
+    """
 
+    def __init__(self, user: UserPayload):
+        super().__init__()
+        # set by ReplicaRouting before any resolver runs
+        self.read_only = False
+        self._values: dict[str, Any] = {"session": user}
+        self._factories: dict[str, Callable[[], Any]] = {
+            "db_session": lambda: new_session(readonly=self.read_only),
+            "mail": lambda: MailClient(get_pool()),
+            "user_service": lambda: UserService(self["db_session"]),
+            "event_service": lambda: EventService(self["db_session"]),
+            "search_event_service": lambda: SearchEventService(open_elastic()),
+            "role_service": lambda: RoleService(self["db_session"]),
+            "assistant_service": lambda: AssistantService(self["db_session"]),
+            "session_service": lambda: SessionService(self["db_session"]),
+            "outbox_service": lambda: OutboxService(self["db_session"]),
+            "notification_service": lambda: NotificationService(self["db_session"]),
+        }
 
-schema = Schema(Queries, Mutations)
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._values:
+            self._values[key] = self._factories[key]()
+        return self._values[key]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._values or key in self._factories
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self[key] if key in self else default
+
+    async def close(self):
+        # only what was actually created needs a teardown
+        db_session = self._values.get("db_session")
+        if db_session is not None:
+            await db_session.close()
+
+
+class ReplicaRouting(SchemaExtension):
+    """
+    Queries read from a replica, unless the same user ran a mutation a moment ago
+    """
+
+    async def on_execute(self):
+        context: GraphQLContext = self.execution_context.context
+        operation = self.execution_context.operation_type
+        user = context["session"]["sub"]
+
+        if operation == OperationType.QUERY:
+            context.read_only = not is_sticky(user)
+
+        if operation == OperationType.MUTATION:
+            # queued in the mutation's own transaction, its commit delivers it and a rollback drops it
+            await notify(context["db_session"], STICKY_CHANNEL, user)
+
+        yield
+
+        if operation == OperationType.MUTATION:
+            STICKY.set(user, True)
+
+
+async def get_context(user: UserSession):
+    context = GraphQLContext(user)
+    try:
+        yield context
+    finally:
+        await context.close()
+
+
+schema = Schema(Queries, Mutations, extensions=[ReplicaRouting] if has_replicas() else [])
 router = GraphQLRouter(schema, context_getter=get_context)
@@ -1,19 +1,112 @@
-from fastapi import APIRouter, HTTPException
+from typing import Annotated
+import math
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from jwt.exceptions import PyJWTError
 from tus_datos_prueba.utils.db import Session
 from tus_datos_prueba.app.services.users import UserService
+from tus_datos_prueba.app.services.tokens import RefreshTokenService
 from tus_datos_prueba.models import User
-from tus_datos_prueba.app.models.users import LoginClaim
-from tus_datos_prueba.utils.jwt import sign_session
+from tus_datos_prueba.app.models.users import LoginClaim, RefreshClaim, TokenPair
+from tus_datos_prueba.utils.jwt import sign_session, validate_session, SESSION_LIFETIME
+from tus_datos_prueba.utils.jwt.perms import load_registry
+from tus_datos_prueba.utils.jwt.revocations import REVOCATIONS
+from tus_datos_prueba.utils.throttle import TokenBucket
+from tus_datos_prueba.config import (
+    TOKEN_FORMAT,
+    LOGIN_IP_BURST,
+    LOGIN_IP_RATE,
+    LOGIN_ACCOUNT_BURST,
+    LOGIN_ACCOUNT_RATE,
+    LOGIN_THROTTLE_KEYS,
+)
 
 router = APIRouter()
 
+OptionalBearer = Annotated[HTTPAuthorizationCredentials | None, Depends(HTTPBearer(auto_error=False))]
+
+LOGIN_IP_THROTTLE = TokenBucket("login_ip", LOGIN_IP_BURST, LOGIN_IP_RATE, LOGIN_THROTTLE_KEYS)
+LOGIN_ACCOUNT_THROTTLE = TokenBucket("login_account", LOGIN_ACCOUNT_BURST, LOGIN_ACCOUNT_RATE, LOGIN_THROTTLE_KEYS)
+
+
+async def _sign(session: Session, user: User) -> str:
+    # reloaded on every sign in so new tokens never carry a stale registry
+    registry = await load_registry(session) if TOKEN_FORMAT == "compact" else None
+
+    return sign_session(user, registry)
+
+
+async def _authenticate(session: Session, request: Request, claim: LoginClaim) -> User:
+    """
+    Every attempt takes a token of the client IP and of the account before any
+    hashing, a successful login gives them back so only failures are throttled
+    """
+    ip = request.client.host if request.client else "unknown"
+    account = claim.email.strip().lower()
+
+    for throttle, key in ((LOGIN_IP_THROTTLE, ip), (LOGIN_ACCOUNT_THROTTLE, account)):
+        if not throttle.acquire(key):
+            if throttle is LOGIN_ACCOUNT_THROTTLE:
+                LOGIN_IP_THROTTLE.refund(ip)
+            retry_after = math.ceil(throttle.retry_after(key))
+            raise HTTPException(429, "too many login attempts", headers={"Retry-After": str(retry_after)})
 
-@router.post('/login')
-async def login(session: Session, claim: LoginClaim) -> str:
     service = UserService(session)
     user = await service.login(claim.email, claim.password)
 
     if user == None:
         raise HTTPException(401, "bad credentials")
 
-    return sign_session(user)
\ No newline at end of file
+    LOGIN_IP_THROTTLE.refund(ip)
+    LOGIN_ACCOUNT_THROTTLE.refund(account)
+    return user
+
+
+@router.post('/login')
+async def login(session: Session, request: Request, claim: LoginClaim) -> str:
+    user = await _authenticate(session, request, claim)
+
+    return await _sign(session, user)
+
+
+@router.post('/token')
+async def token(session: Session, request: Request, claim: LoginClaim) -> TokenPair:
+    user = await _authenticate(session, request, claim)
+
+    # sign before committing, the commit expires the loaded role
+    access_token = await _sign(session, user)
+    refresh_token = await RefreshTokenService(session).issue(user.id)
+
+    return TokenPair(access_token=access_token, refresh_token=refresh_token, expires_in=int(SESSION_LIFETIME.total_seconds()))
+
+
+@router.post('/refresh')
+async def refresh(session: Session, claim: RefreshClaim) -> TokenPair:
+    service = RefreshTokenService(session)
+    stored = await service.get_active(claim.refresh_token)
+
+    if stored is None:
+        raise HTTPException(401, "invalid refresh token")
+
+    access_token = await _sign(session, stored.user)
+    refresh_token = await service.rotate(stored)
+
+    if refresh_token is None:
+        raise HTTPException(401, "invalid refresh token")
+
+    return TokenPair(access_token=access_token, refresh_token=refresh_token, expires_in=int(SESSION_LIFETIME.total_seconds()))
+
+
+@router.post('/logout', status_code=204)
+async def logout(session: Session, claim: RefreshClaim, creds: OptionalBearer) -> None:
+    await RefreshTokenService(session).revoke(claim.refresh_token)
+
+    # the access token sent along is revoked too
+    if creds is not None:
+        try:
+            payload = validate_session(creds.credentials)
+        except PyJWTError:
+            return
+
+        if "jti" in payload:
+            await REVOCATIONS.revoke(session, payload["jti"], payload["exp"])
@@ -1,7 +1,11 @@
-from sqlalchemy import select
+from sqlalchemy import Select, select
 from tus_datos_prueba.utils.db import Session
 from tus_datos_prueba.models import Assistant
 from uuid import UUID
+from tus_datos_prueba.utils.db.pagination import Page, paginate, page_size
+
+# sort of assistant pages, matches ix_assistants_page
+ASSISTANT_PAGE_KEYS = (Assistant.created_at, Assistant.id)
 
 class AssistantService:
     def __init__(self, session: Session):
@@ -45,16 +49,18 @@ class AssistantService:
         return assistant
     
     async def list_assistants(self, limit: int | None = None, offset: int | None = None) -> list[Assistant]:
-        query = select(Assistant)
+        query = select(Assistant).order_by(*ASSISTANT_PAGE_KEYS)
         
         if offset is not None:
             query = query.offset(offset)
 
-        if limit is not None:
-            query = query.limit(limit)
+        query = query.limit(page_size(limit))
 
         assistants = list(await self.session.scalars(query))
         return assistants
+
+    async def page_assistants(self, first: int, after: str | None = None) -> Page[Assistant]:
+        return await paginate(self.session, select(Assistant), ASSISTANT_PAGE_KEYS, first, after)
     
     async def update(self, id: UUID, email: str | None = None, full_name: str | None = None, type: int | None = None, meta: dict | None = None, contact_meta: dict | None = None) -> None:
         assistant = await self.get_by_id(id)
@@ -84,6 +90,9 @@ class AssistantService:
         await self.session.delete(assistant)
         await self.session.commit()
 
+    def select_emails_by_event_id(self, event_id: UUID) -> Select:
+        return select(Assistant.email).where(Assistant.event_id == event_id)
+
     async def get_assistants_by_event_id(self, event_id: UUID) -> list[Assistant]:
         assistants = await self.session.scalars(select(Assistant).where(Assistant.event_id == event_id))
         return assistants
\ No newline at end of file
@@ -1,10 +1,16 @@
-from sqlalchemy import select, func
+import json
+from base64 import urlsafe_b64decode
+from sqlalchemy import any_, select, func
 from tus_datos_prueba.models.events import Assistant
 from tus_datos_prueba.utils.db import Session
 from tus_datos_prueba.utils.elastic import Elastic
 from tus_datos_prueba.models import Event, User
 from datetime import datetime
 from uuid import UUID
+from tus_datos_prueba.utils.db.pagination import Count, CountMode, Page, encode_cursor, paginate, page_size
+
+# sort of event pages, matches ix_events_active_page
+EVENT_PAGE_KEYS = (Event.start_date, Event.id)
 
 class EventService:
     def __init__(self, session: Session):
@@ -46,22 +52,36 @@ class EventService:
         query = select(Event).where(Event.id == id, Event.active == True).limit(1)
 
         return await self.session.scalar(query)
+
+    async def get_by_ids(self, ids: list[UUID]) -> list[Event]:
+        """
+        Active events of `ids` in one query, in the order of `ids`; missing or inactive ones are left out
+        """
+        if not ids:
+            return []
+
+        query = select(Event).where(Event.id == any_(ids), Event.active == True)
+        events = {event.id: event for event in await self.session.scalars(query)}
+
+        return [events[id] for id in ids if id in events]
     
     async def get_email_by_id(self, id: UUID) -> str:
         query = select(User.email).join(Event, Event.created_by_id == User.id).where(Event.id == id).limit(1)
         return await self.session.scalar(query)
     
     async def list_events(self, limit: int | None = None, offset: int | None = None) -> list[Event]:
-        query = select(Event).where(Event.active == True)
+        query = select(Event).where(Event.active == True).order_by(*EVENT_PAGE_KEYS)
         
         if offset is not None:
             query = query.offset(offset)
 
-        if limit is not None:
-            query = query.limit(limit)
+        query = query.limit(page_size(limit))
 
         events = list(await self.session.scalars(query))
         return events
+
+    async def page_events(self, first: int, after: str | None = None) -> Page[Event]:
+        return await paginate(self.session, select(Event).where(Event.active == True), EVENT_PAGE_KEYS, first, after)
     
     async def update(self, event: Event):
         await self.session.flush()
@@ -107,13 +127,23 @@ class SearchEventService:
         self.elastic_search = elastic
 
     # search("evento nuevo", {"start_date": ["2024-10-10", "2024-10-11"], "assistant_count": [1, 10], "assitant_limit": 1, "location": "cartagena", "category": "tecg"})
-    async def search(self, text_search: str, props: SearchProps | None = None) -> list[UUID]:
+    async def search(self, text_search: str, props: SearchProps | None = None, size: int = 10, search_after: str | None = None, source: list[str] | None = None) -> Page:
+        """
+        Ids of the matching events by relevance, `size` at a time; `search_after` is the cursor of the last hit of the previous page.
+        With `source` the items are the indexed documents instead, restricted to those fields.
+        """
+        props = props or dict()
+
         sort = [
             {
                 "_score": {"order": "desc"}
             },
             {
                 "start_date": {"order": "desc"}
+            },
+            # unique tie breaker, search_after needs a total order
+            {
+                "id": {"order": "asc"}
             }
         ]
 
@@ -173,9 +203,46 @@ class SearchEventService:
         query = {
             "bool": {
                 "must": main_query,
-                "should": sidecar
+                "should": sidecar,
+                # documents indexed before `active` was part of the pipeline have no such field
+                "must_not": {
+                    "term": {"active": False}
+                }
             }
         }
 
-        result = await self.elastic_search.search(source=False, fields=["id"], query=query, sort=sort)
-        return list(map(lambda hit: UUID(hit['fields']['id'][0]), result['hits']['hits']))
\ No newline at end of file
+        options = dict()
+        if search_after is not None:
+            options["search_after"] = self.decode_cursor(search_after)
+
+        # one extra hit tells whether there is a next page
+        if source is not None:
+            options["source"] = source
+        else:
+            options["source"] = False
+            options["fields"] = ["id"]
+
+        result = await self.elastic_search.search(query=query, sort=sort, size=size + 1, **options)
+        hits = result['hits']['hits'][:size]
+        total = result['hits']['total']
+
+        async def count(exact: bool = False) -> Count:
+            # elasticsearch counts up to 10000 hits, past that the total is a lower bound
+            return Count(total['value'], CountMode.EXACT if total['relation'] == "eq" else CountMode.CAPPED)
+
+        return Page(
+            items=[hit['_source'] if source is not None else UUID(hit['fields']['id'][0]) for hit in hits],
+            cursors=[encode_cursor(tuple(hit['sort'])) for hit in hits],
+            has_next=len(result['hits']['hits']) > size,
+            has_previous=search_after is not None,
+            count=count,
+        )
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> list:
+        try:
+            values = json.loads(urlsafe_b64decode(cursor.encode()))
+            assert isinstance(values, list) and len(values) == 3
+            return values
+        except Exception:
+            raise ValueError("Invalid cursor")
\ No newline at end of file
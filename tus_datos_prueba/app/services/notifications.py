@@ -0,0 +1,41 @@
+from datetime import timedelta
+from sqlalchemy import select, func, or_
+from tus_datos_prueba.utils.db import Session
+from tus_datos_prueba.models.notifications import NotificationJob, NotificationJobStatus
+from uuid import UUID
+
+class NotificationService:
+    def __init__(self, session: Session):
+        self.session = session
+
+    async def create_job(self, subject: str, body: str, event_id: UUID) -> NotificationJob:
+        """
+        Add the job to the current transaction, start it once committed.
+        The recipients are the assistants of `event_id`.
+        """
+        job = NotificationJob(subject=subject, body=body, event_id=event_id, sent=0, failed=0, failures=[])
+        self.session.add(job)
+        await self.session.flush()
+
+        return job
+
+    async def get_by_id(self, id: UUID) -> NotificationJob | None:
+        return await self.session.scalar(select(NotificationJob).where(NotificationJob.id == id).limit(1))
+
+    async def claim_stale(self, lease: float, limit: int = 10) -> list[NotificationJob]:
+        """
+        Lock RUNNING jobs whose worker stopped sending heartbeats, rows locked by other workers are skipped.
+        The lock lasts until the caller commits.
+        """
+        query = (
+            select(NotificationJob)
+            .where(
+                NotificationJob.status == NotificationJobStatus.RUNNING,
+                or_(NotificationJob.heartbeat_at.is_(None), NotificationJob.heartbeat_at < func.now() - timedelta(seconds=lease)),
+            )
+            .order_by(NotificationJob.created_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+
+        return list(await self.session.scalars(query))
@@ -0,0 +1,58 @@
+from sqlalchemy import select, func
+from tus_datos_prueba.utils.db import Session
+from tus_datos_prueba.models.outbox import OutboxMessage, OutboxStatus
+from datetime import datetime, timedelta, timezone
+import random
+
+class OutboxService:
+    def __init__(self, session: Session):
+        self.session = session
+
+    async def enqueue(self, subject: str, recipients: str | list[str], body: str, html: bool = False, commit: bool = False) -> OutboxMessage:
+        """
+        Add an email to the current transaction, it is sent once the transaction commits.
+        Use `commit` when there is no other change to commit with it.
+        """
+        if isinstance(recipients, str):
+            recipients = [recipients]
+
+        message = OutboxMessage(subject=subject, recipients=recipients, body=body, html=html)
+        self.session.add(message)
+
+        if commit:
+            await self.session.commit()
+
+        return message
+
+    async def claim(self, limit: int) -> list[OutboxMessage]:
+        """
+        Lock a batch of due messages, rows locked by other workers are skipped.
+        The lock lasts until the caller commits.
+        """
+        query = (
+            select(OutboxMessage)
+            .where(OutboxMessage.status == OutboxStatus.PENDING, OutboxMessage.next_attempt_at <= func.now())
+            .order_by(OutboxMessage.next_attempt_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+
+        return list(await self.session.scalars(query))
+
+    def mark_sent(self, message: OutboxMessage):
+        message.status = OutboxStatus.SENT
+        message.sent_at = datetime.now(tz=timezone.utc)
+        message.last_error = None
+
+    def mark_failed(self, message: OutboxMessage, error: str, max_attempts: int, backoff: float, max_backoff: float):
+        message.attempts += 1
+        message.last_error = error
+
+        if message.attempts >= max_attempts:
+            message.status = OutboxStatus.FAILED
+            return
+
+        # exponential backoff with jitter so retries of a burst do not align
+        delay = min(backoff * 2 ** (message.attempts - 1), max_backoff)
+        delay = delay * random.uniform(0.5, 1)
+        message.next_attempt_at = datetime.now(tz=timezone.utc) + timedelta(seconds=delay)
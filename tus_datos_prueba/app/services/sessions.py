@@ -3,6 +3,10 @@ from tus_datos_prueba.models.events import Session as Session_model
 from tus_datos_prueba.utils.db import Session
 from datetime import datetime
 from uuid import UUID
+from tus_datos_prueba.utils.db.pagination import Page, paginate, page_size
+
+# sort of the sessions of an event, matches ix_sessions_event_page
+SESSION_PAGE_KEYS = (Session_model.start_date, Session_model.id)
 
 class SessionService:
     def __init__(self, session: Session):
@@ -16,14 +20,17 @@ class SessionService:
         return result.scalar_one_or_none()
 
     async def list_sessions(self, event_id: UUID, limit: int | None = None, offset: int | None = None) -> list[Session_model]:
-        stmt = select(Session_model).where(Session_model.event_id == event_id, Session_model.active == True)
+        stmt = select(Session_model).where(Session_model.event_id == event_id, Session_model.active == True).order_by(*SESSION_PAGE_KEYS)
         if offset is not None:
             stmt = stmt.offset(offset)
-        if limit is not None:
-            stmt = stmt.limit(limit)
+        stmt = stmt.limit(page_size(limit))
         result = await self.session.execute(stmt)
         return result.scalars().all()
 
+    async def page_sessions(self, event_id: UUID, first: int, after: str | None = None) -> Page[Session_model]:
+        stmt = select(Session_model).where(Session_model.event_id == event_id, Session_model.active == True)
+        return await paginate(self.session, stmt, SESSION_PAGE_KEYS, first, after)
+
     async def create_session(
         self,
         event_id: UUID,
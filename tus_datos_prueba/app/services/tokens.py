@@ -0,0 +1,87 @@
+from tus_datos_prueba.utils.db import Session
+from tus_datos_prueba.models import User, Role
+from tus_datos_prueba.models.tokens import RefreshToken
+from tus_datos_prueba.config import REFRESH_TOKEN_LIFETIME
+from sqlalchemy.orm import contains_eager, joinedload
+from sqlalchemy import select, update, func
+from datetime import datetime, timedelta, timezone
+from hashlib import sha256
+from uuid import UUID, uuid4
+import secrets
+
+
+def _hash(token: str) -> bytes:
+    return sha256(token.encode()).digest()
+
+
+class RefreshTokenService:
+    def __init__(self, session: Session):
+        self.session = session
+
+    async def issue(self, user_id: UUID, family_id: UUID | None = None, commit: bool = True) -> str:
+        token = secrets.token_urlsafe(32)
+        self.session.add(RefreshToken(
+            token_hash=_hash(token),
+            family_id=family_id or uuid4(),
+            user_id=user_id,
+            expires_at=datetime.now(tz=timezone.utc) + timedelta(seconds=REFRESH_TOKEN_LIFETIME),
+        ))
+
+        if commit:
+            await self.session.commit()
+
+        return token
+
+    async def get_active(self, token: str) -> RefreshToken | None:
+        """
+        Token with its active user, role and permissions in one query.
+        Presenting an already rotated token revokes the whole family.
+        """
+        query = (
+            select(RefreshToken)
+            .join(RefreshToken.user)
+            # the user comes from the join the filter uses, not a second one
+            .options(contains_eager(RefreshToken.user).joinedload(User.role).joinedload(Role.permissions))
+            .where(RefreshToken.token_hash == _hash(token), User.active == True)
+        )
+        stored = (await self.session.scalars(query)).unique().one_or_none()
+
+        if stored is None or stored.expires_at <= datetime.now(tz=timezone.utc):
+            return None
+
+        if stored.revoked_at is not None:
+            await self.revoke_family(stored.family_id)
+            return None
+
+        return stored
+
+    async def rotate(self, stored: RefreshToken) -> str | None:
+        """
+        Revoke `stored` and issue its successor, None when it was already rotated concurrently
+        """
+        user_id, family_id = stored.user_id, stored.family_id
+
+        result = await self.session.execute(
+            update(RefreshToken)
+            .where(RefreshToken.id == stored.id, RefreshToken.revoked_at == None)
+            .values(revoked_at=func.now())
+        )
+        if result.rowcount != 1:
+            await self.session.rollback()
+            await self.revoke_family(family_id)
+            return None
+
+        return await self.issue(user_id, family_id)
+
+    async def revoke(self, token: str):
+        family_id = await self.session.scalar(select(RefreshToken.family_id).where(RefreshToken.token_hash == _hash(token)))
+        if family_id is not None:
+            await self.revoke_family(family_id)
+
+    async def revoke_family(self, family_id: UUID):
+        await self.session.execute(
+            update(RefreshToken)
+            .where(RefreshToken.family_id == family_id, RefreshToken.revoked_at == None)
+            .values(revoked_at=func.now())
+        )
+        await self.session.commit()
@@ -2,18 +2,29 @@ from tus_datos_prueba.utils.db import Session
 from tus_datos_prueba.models import User, Role, UserPassword
 from sqlalchemy.orm import joinedload
 from sqlalchemy import and_, select, update, insert
-from tus_datos_prueba.utils.password import verify_password, create_password
+from tus_datos_prueba.utils.password import verify_password_async, create_password_async
+from tus_datos_prueba.utils.db.notify import notify
+from tus_datos_prueba.utils.jwt.auth import USER_CHANNEL, USER_LIVENESS
+from tus_datos_prueba.utils.db.pagination import Page, paginate, page_size
 from uuid import UUID
 
+# sort of user pages, matches ix_users_active_page
+USER_PAGE_KEYS = (User.created_at, User.id)
+
 class UserService:
     def __init__(self, session: Session):
         self.session = session
 
     async def login(self, email: str, password: str) -> User | None:
-        query = select(User).options(joinedload(User.passwords), joinedload(User.role).subqueryload(Role.permissions)).where(User.email == email).limit(1)
-        user = await self.session.scalar(query)
+        # one round trip: the user, its active password and the role permissions
+        query = (
+            select(User)
+            .options(joinedload(User.current_password), joinedload(User.role).joinedload(Role.permissions))
+            .where(User.email == email, User.active == True)
+        )
+        user = (await self.session.scalars(query)).unique().first()
 
-        if user is not None and verify_password(password, user.active_password.password):
+        if user is not None and user.current_password is not None and await verify_password_async(password, user.current_password.password):
             return user
 
     async def create(self, email: str, password: str, role: int, metadata: dict = None):
@@ -21,7 +32,7 @@ class UserService:
         user.email = email
         user.role_id = role
         user.meta = metadata
-        user.passwords = [UserPassword(password=create_password(password))]
+        user.passwords = [UserPassword(password=await create_password_async(password))]
 
         try:
             self.session.add(user)
@@ -41,32 +52,51 @@ class UserService:
         return user
     
     async def get_id(self, id: UUID) -> User | None:
-        user = await self.session.scalar(select(User).where(and_(User.id == id, User.active == True)).options(joinedload(User.passwords)).limit(1))
+        user = await self.session.scalar(select(User).where(and_(User.id == id, User.active == True)).limit(1))
 
         return user
     
     async def list_users(self, limit: int | None = None, offset: int | None = None) -> list[User]:
-        query = select(User).where(User.active == True)
+        query = select(User).where(User.active == True).order_by(*USER_PAGE_KEYS)
         
         if offset is not None:
             query = query.offset(offset)
 
-        if limit is not None:
-            query = query.limit(limit)
+        query = query.limit(page_size(limit))
 
         users = list(await self.session.scalars(query))
         return users
+
+    async def page_users(self, first: int, after: str | None = None) -> Page[User]:
+        return await paginate(self.session, select(User).where(User.active == True), USER_PAGE_KEYS, first, after)
     
     async def update(self, user: User):
         await self.session.flush()
+        user_id = await self._notify_changed(user)
         await self.session.commit()
+        USER_LIVENESS.pop(user_id)
 
     async def delete(self, user: User):
         user.active = False
         await self.session.flush()
+        user_id = await self._notify_changed(user)
         await self.session.commit()
+        USER_LIVENESS.pop(user_id)
+
+    async def _notify_changed(self, user: User) -> UUID:
+        # delivered to every worker on commit, they drop the cached liveness
+        await notify(self.session, USER_CHANNEL, str(user.id))
+        return user.id
 
     async def change_password(self, user: User, password: str):
-        user.passwords.append(UserPassword(password=create_password(password)))
-        await self.session.flush()
+        hashed = await create_password_async(password)
+
+        # concurrent changes of the same user wait here, so the update below sees the latest row
+        await self.session.execute(select(User.id).where(User.id == user.id).with_for_update())
+        await self.session.execute(
+            update(UserPassword)
+            .where(UserPassword.user_id == user.id, UserPassword.active == True)
+            .values(active=False)
+        )
+        self.session.add(UserPassword(user_id=user.id, password=hashed))
         await self.session.commit()
\ No newline at end of file
@@ -0,0 +1,132 @@
+import asyncio
+from datetime import datetime, timezone
+from uuid import UUID
+from prometheus_client import Counter
+from sqlalchemy import Select, select, func
+from tus_datos_prueba.app.services.notifications import NotificationService
+from tus_datos_prueba.models.events import Assistant
+from tus_datos_prueba.models.notifications import NotificationJob, NotificationJobStatus
+from tus_datos_prueba.utils.db import new_session
+from tus_datos_prueba.utils.mail import MailClient, get_pool
+from tus_datos_prueba.utils.mail.compose import compose_email
+from tus_datos_prueba.utils.tasks import spawn
+from tus_datos_prueba.config import (
+    NOTIFY_CONCURRENCY,
+    NOTIFY_CHUNK_SIZE,
+    NOTIFY_MAX_FAILURES_KEPT,
+    NOTIFY_JOB_LEASE,
+    NOTIFY_JOB_MAX_ATTEMPTS,
+)
+
+NOTIFY_SENT_METRIC = Counter("notification_sent", "Bulk notification emails sent")
+NOTIFY_FAILED_METRIC = Counter("notification_failed", "Bulk notification emails that could not be sent")
+NOTIFY_JOB_RESUMED_METRIC = Counter("notification_job_resumed", "Notification jobs resumed after their worker stopped")
+NOTIFY_JOB_ABANDONED_METRIC = Counter("notification_job_abandoned", "Notification jobs marked FAILED because they could not be resumed")
+
+
+def select_recipients(event_id: UUID) -> Select:
+    # a stable order, a resumed job skips the `sent + failed` first ones
+    return select(Assistant.email).where(Assistant.event_id == event_id).order_by(Assistant.id)
+
+
+async def run_notification_job(job_id: UUID):
+    """
+    Send the job body to the assistants of its event, streamed from the database
+    in chunks and sent with bounded concurrency over the SMTP pool.
+    Progress and a heartbeat are committed to the job row after each chunk,
+    a job resumed by another worker continues after the last committed chunk.
+    """
+    mail = MailClient(get_pool())
+    limit = asyncio.Semaphore(NOTIFY_CONCURRENCY)
+
+    # the job row is updated after each commit, keep it loaded
+    async with new_session(expire_on_commit=False) as session, new_session() as reader:
+        job = await session.get(NotificationJob, job_id)
+        if job is None or job.status != NotificationJobStatus.RUNNING:
+            return
+
+        async def send(email: str):
+            async with limit:
+                await mail.send_message(compose_email(job.subject, email, job.body))
+
+        recipients = select_recipients(job.event_id)
+        # set once the job is over, a cancelled job stays RUNNING
+        status = None
+
+        try:
+            if job.total is None:
+                job.total = await reader.scalar(select(func.count()).select_from(recipients.subquery()))
+            job.heartbeat_at = datetime.now(tz=timezone.utc)
+            await session.commit()
+
+            # server side cursor, recipients are never loaded all at once
+            resumed = recipients.offset(job.sent + job.failed).execution_options(yield_per=NOTIFY_CHUNK_SIZE)
+            stream = await reader.stream_scalars(resumed)
+            async for chunk in stream.partitions():
+                results = await asyncio.gather(*(send(email) for email in chunk), return_exceptions=True)
+
+                failures = list(job.failures)
+                for email, result in zip(chunk, results):
+                    if isinstance(result, Exception):
+                        job.failed += 1
+                        NOTIFY_FAILED_METRIC.inc()
+                        if len(failures) < NOTIFY_MAX_FAILURES_KEPT:
+                            failures.append({"email": email, "error": f"{type(result).__name__}: {result}"})
+                    else:
+                        job.sent += 1
+                        NOTIFY_SENT_METRIC.inc()
+                job.failures = failures
+                job.heartbeat_at = datetime.now(tz=timezone.utc)
+
+                await session.commit()
+
+            status = NotificationJobStatus.FINISHED
+        except asyncio.CancelledError:
+            # worker shutting down, the job stays RUNNING and the next poll of any worker resumes it
+            await session.rollback()
+            job.heartbeat_at = None
+            await asyncio.shield(session.commit())
+            raise
+        except Exception:
+            await session.rollback()
+            status = NotificationJobStatus.FAILED
+            raise
+        finally:
+            if status is not None:
+                job.status = status
+                job.finished_at = datetime.now(tz=timezone.utc)
+                await asyncio.shield(session.commit())
+
+
+def start_notification_job(job_id: UUID) -> asyncio.Task:
+    """
+    Run the job in background, the job row must be committed before
+    """
+    return spawn(run_notification_job(job_id), f"notification_job_{job_id}")
+
+
+async def resume_notification_jobs():
+    """
+    Claim RUNNING jobs left behind by a stopped worker and resume them here,
+    jobs that keep failing or were created without a body are marked FAILED
+    """
+    async with new_session() as session:
+        jobs = await NotificationService(session).claim_stale(NOTIFY_JOB_LEASE)
+
+        resumed = list()
+        for job in jobs:
+            if job.body is None or job.event_id is None or job.attempts >= NOTIFY_JOB_MAX_ATTEMPTS:
+                job.status = NotificationJobStatus.FAILED
+                job.finished_at = datetime.now(tz=timezone.utc)
+                NOTIFY_JOB_ABANDONED_METRIC.inc()
+            else:
+                job.attempts += 1
+                # taken, other workers skip it until the lease runs out again
+                job.heartbeat_at = datetime.now(tz=timezone.utc)
+                resumed.append(job.id)
+
+        await session.commit()
+
+    for job_id in resumed:
+        NOTIFY_JOB_RESUMED_METRIC.inc()
+        start_notification_job(job_id)
@@ -0,0 +1,60 @@
+import asyncio
+from prometheus_client import Counter
+from tus_datos_prueba.app.services.outbox import OutboxService
+from tus_datos_prueba.models.outbox import OutboxMessage
+from tus_datos_prueba.utils.db import new_session
+from tus_datos_prueba.utils.mail import MailClient, get_pool
+from tus_datos_prueba.utils.mail.compose import compose_email
+from tus_datos_prueba.config import (
+    OUTBOX_BATCH_SIZE,
+    OUTBOX_MAX_ATTEMPTS,
+    OUTBOX_BACKOFF,
+    OUTBOX_MAX_BACKOFF,
+)
+
+OUTBOX_SENT_METRIC = Counter("outbox_sent", "Outbox emails delivered")
+OUTBOX_RETRIED_METRIC = Counter("outbox_retried", "Outbox deliveries scheduled for retry")
+OUTBOX_FAILED_METRIC = Counter("outbox_failed", "Outbox emails given up after OUTBOX_MAX_ATTEMPTS")
+
+
+async def _send(mail: MailClient, message: OutboxMessage):
+    await mail.send_message(compose_email(message.subject, message.recipients, message.body, message.html))
+
+
+async def deliver_batch(limit: int = OUTBOX_BATCH_SIZE) -> int:
+    """
+    Claim and send one batch of due emails, returns how many were claimed
+    """
+    mail = MailClient(get_pool())
+
+    async with new_session() as session:
+        outbox = OutboxService(session)
+        messages = await outbox.claim(limit)
+        if not messages:
+            await session.rollback()
+            return 0
+
+        # concurrency is bounded by the size of the SMTP pool
+        results = await asyncio.gather(*(_send(mail, message) for message in messages), return_exceptions=True)
+
+        for message, result in zip(messages, results):
+            if isinstance(result, Exception):
+                outbox.mark_failed(message, f"{type(result).__name__}: {result}", OUTBOX_MAX_ATTEMPTS, OUTBOX_BACKOFF, OUTBOX_MAX_BACKOFF)
+                if message.attempts >= OUTBOX_MAX_ATTEMPTS:
+                    OUTBOX_FAILED_METRIC.inc()
+                else:
+                    OUTBOX_RETRIED_METRIC.inc()
+            else:
+                outbox.mark_sent(message)
+                OUTBOX_SENT_METRIC.inc()
+
+        await session.commit()
+        return len(messages)
+
+
+async def deliver_outbox():
+    """
+    Drain every due email, runs from a background task
+    """
+    while await deliver_batch() >= OUTBOX_BATCH_SIZE:
+        pass
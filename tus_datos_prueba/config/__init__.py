@@ -15,11 +15,95 @@ POSTGRES_PASSWORD = env.get("POSTGRES_PASSWORD", "postgres")
 POSTGRES_HOST = env.get("POSTGRES_HOST", "localhost:5432")
 
 POSTGRES_URI = f"postgresql+psycopg://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_HOST}/{POSTGRES_DB}"
+POSTGRES_DSN = f"postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_HOST}/{POSTGRES_DB}"
+
+# comma separated read replicas, same database and credentials as the primary
+POSTGRES_REPLICA_HOSTS = [host.strip() for host in env.get("POSTGRES_REPLICA_HOSTS", "").split(",") if host.strip()]
+POSTGRES_REPLICA_URIS = [f"postgresql+psycopg://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{host}/{POSTGRES_DB}" for host in POSTGRES_REPLICA_HOSTS]
+DB_REPLICA_MAX_LAG = float(env.get("DB_REPLICA_MAX_LAG", "5"))
+DB_REPLICA_LAG_INTERVAL = float(env.get("DB_REPLICA_LAG_INTERVAL", "5"))
+DB_REPLICA_STICKY_SECONDS = float(env.get("DB_REPLICA_STICKY_SECONDS", "10"))
+
+# GraphQL list pages
+PAGE_SIZE_DEFAULT = int(env.get("PAGE_SIZE_DEFAULT", "20"))
+PAGE_SIZE_MAX = int(env.get("PAGE_SIZE_MAX", "100"))
+LIST_COUNT_CACHE_TTL = float(env.get("LIST_COUNT_CACHE_TTL", "30"))
+LIST_COUNT_EXACT_CAP = int(env.get("LIST_COUNT_EXACT_CAP", "10000"))
+
+# per worker, size * workers + overflow * workers must fit the server max_connections
+DB_POOL_SIZE = int(env.get("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(env.get("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(env.get("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(env.get("DB_POOL_RECYCLE", "-1"))
+DB_POOL_PRE_PING = env.get("DB_POOL_PRE_PING", "false") in ["true", "yes"]
+
+DB_PROBE_INTERVAL = float(env.get("DB_PROBE_INTERVAL", "15"))
+DB_METRICS_INTERVAL = float(env.get("DB_METRICS_INTERVAL", "30"))
+DB_TABLE_COUNT_EXACT = env.get("DB_TABLE_COUNT_EXACT", "false") in ["true", "yes"]
+DB_TABLE_COUNT_ESTIMATE_ABOVE = int(env.get("DB_TABLE_COUNT_ESTIMATE_ABOVE", "100000"))
 
 ELASTIC_HOSTS = env.get("ELASTIC_HOSTS", "http://localhost:9200").split(";")
+ELASTIC_CONNECTIONS_PER_NODE = int(env.get("ELASTIC_CONNECTIONS_PER_NODE", "10"))
+ELASTIC_REQUEST_TIMEOUT = float(env.get("ELASTIC_REQUEST_TIMEOUT", "10"))
+ELASTIC_MAX_RETRIES = int(env.get("ELASTIC_MAX_RETRIES", "3"))
+ELASTIC_RETRY_ON_TIMEOUT = env.get("ELASTIC_RETRY_ON_TIMEOUT", "true") in ["true", "yes"]
+ELASTIC_METRICS_INTERVAL = float(env.get("ELASTIC_METRICS_INTERVAL", "15"))
+ELASTIC_REINDEX_BATCH_SIZE = int(env.get("ELASTIC_REINDEX_BATCH_SIZE", "1000"))
+
+LOG_QUEUE_SIZE = int(env.get("LOG_QUEUE_SIZE", "10000"))
+LOG_BATCH_SIZE = int(env.get("LOG_BATCH_SIZE", "500"))
+LOG_FLUSH_INTERVAL = float(env.get("LOG_FLUSH_INTERVAL", "1"))
+# "drop": discard when the queue is full, "sample": keep LOG_SAMPLE_RATE of the logs once over the watermark
+LOG_OVERFLOW_POLICY = env.get("LOG_OVERFLOW_POLICY", "drop")
+LOG_SAMPLE_RATE = float(env.get("LOG_SAMPLE_RATE", "0.1"))
+LOG_SAMPLE_WATERMARK = float(env.get("LOG_SAMPLE_WATERMARK", "0.8"))
+LOG_SPOOL_DIR = env.get("LOG_SPOOL_DIR", "/tmp/tus_datos_prueba/spool")
+LOG_SPOOL_SEGMENT_BYTES = int(env.get("LOG_SPOOL_SEGMENT_BYTES", str(8 * 1024 * 1024)))
+LOG_SPOOL_MAX_BYTES = int(env.get("LOG_SPOOL_MAX_BYTES", str(512 * 1024 * 1024)))
+LOG_SPOOL_REPLAY_INTERVAL = float(env.get("LOG_SPOOL_REPLAY_INTERVAL", "30"))
+
+AUTH_CACHE_SIZE = int(env.get("AUTH_CACHE_SIZE", "10000"))
+AUTH_CACHE_TTL = float(env.get("AUTH_CACHE_TTL", "60"))
+TOKEN_CACHE_SIZE = int(env.get("TOKEN_CACHE_SIZE", "10000"))
+# "full" embeds the permissions dict, "compact" a bitmask over the permission registry
+TOKEN_FORMAT = env.get("TOKEN_FORMAT", "full")
+# login attempts, failed ones keep the token taken; rates are per second
+LOGIN_IP_BURST = float(env.get("LOGIN_IP_BURST", "20"))
+LOGIN_IP_RATE = float(env.get("LOGIN_IP_RATE", "0.2"))
+LOGIN_ACCOUNT_BURST = float(env.get("LOGIN_ACCOUNT_BURST", "5"))
+LOGIN_ACCOUNT_RATE = float(env.get("LOGIN_ACCOUNT_RATE", str(1 / 60)))
+LOGIN_THROTTLE_KEYS = int(env.get("LOGIN_THROTTLE_KEYS", "100000"))
+REFRESH_TOKEN_LIFETIME = int(env.get("REFRESH_TOKEN_LIFETIME", str(30 * 24 * 3600)))
+REVOCATION_BLOOM_CAPACITY = int(env.get("REVOCATION_BLOOM_CAPACITY", "100000"))
+REVOCATION_BLOOM_ERROR_RATE = float(env.get("REVOCATION_BLOOM_ERROR_RATE", "0.001"))
+REVOCATION_REFRESH_INTERVAL = float(env.get("REVOCATION_REFRESH_INTERVAL", "30"))
+PERMISSION_REFRESH_INTERVAL = float(env.get("PERMISSION_REFRESH_INTERVAL", "60"))
+
+# "thread" or "process", bcrypt releases the GIL so threads are usually enough
+PASSWORD_EXECUTOR = env.get("PASSWORD_EXECUTOR", "thread")
+PASSWORD_WORKERS = int(env.get("PASSWORD_WORKERS", "4"))
+PASSWORD_MAX_CONCURRENCY = int(env.get("PASSWORD_MAX_CONCURRENCY", env.get("PASSWORD_WORKERS", "4")))
 
 MAIL_HOST = env.get("MAIL_HOST", "localhost:1025")
 MAIL_USER = env.get("MAIL_USER")
 MAIL_PASSWORD = env.get("MAIL_PASSWORD")
 MAIL_FROM = env.get("MAIL_FROM", "Prueba Tus Datos <prueba@localhost>")
-MAIL_TLS = env.get("MAIL_TLS", "false") in ["true", "yes"]
\ No newline at end of file
+MAIL_TLS = env.get("MAIL_TLS", "false") in ["true", "yes"]
+MAIL_TIMEOUT = float(env.get("MAIL_TIMEOUT", "30"))
+MAIL_POOL_MIN_SIZE = int(env.get("MAIL_POOL_MIN_SIZE", "0"))
+MAIL_POOL_MAX_SIZE = int(env.get("MAIL_POOL_MAX_SIZE", "5"))
+MAIL_POOL_IDLE_TIMEOUT = float(env.get("MAIL_POOL_IDLE_TIMEOUT", "60"))
+
+OUTBOX_POLL_INTERVAL = float(env.get("OUTBOX_POLL_INTERVAL", "2"))
+OUTBOX_BATCH_SIZE = int(env.get("OUTBOX_BATCH_SIZE", "50"))
+OUTBOX_MAX_ATTEMPTS = int(env.get("OUTBOX_MAX_ATTEMPTS", "8"))
+OUTBOX_BACKOFF = float(env.get("OUTBOX_BACKOFF", "5"))
+OUTBOX_MAX_BACKOFF = float(env.get("OUTBOX_MAX_BACKOFF", "3600"))
+
+NOTIFY_CONCURRENCY = int(env.get("NOTIFY_CONCURRENCY", "10"))
+NOTIFY_CHUNK_SIZE = int(env.get("NOTIFY_CHUNK_SIZE", "500"))
+NOTIFY_MAX_FAILURES_KEPT = int(env.get("NOTIFY_MAX_FAILURES_KEPT", "100"))
+# a RUNNING job without heartbeat for NOTIFY_JOB_LEASE seconds is resumed by another worker
+NOTIFY_JOB_POLL_INTERVAL = float(env.get("NOTIFY_JOB_POLL_INTERVAL", "30"))
+NOTIFY_JOB_LEASE = float(env.get("NOTIFY_JOB_LEASE", "300"))
+NOTIFY_JOB_MAX_ATTEMPTS = int(env.get("NOTIFY_JOB_MAX_ATTEMPTS", "3"))
\ No newline at end of file
@@ -2,6 +2,9 @@ from tus_datos_prueba.models._base import ModelBase
 from tus_datos_prueba.models.roles import *
 from tus_datos_prueba.models.users import *
 from tus_datos_prueba.models.events import *
+from tus_datos_prueba.models.outbox import *
+from tus_datos_prueba.models.notifications import *
+from tus_datos_prueba.models.tokens import *
 
 __all__ = [
     "Role",
@@ -10,6 +13,10 @@ __all__ = [
     "Event",
     "Assistant",
     "Session",
+    "OutboxMessage",
+    "NotificationJob",
+    "RefreshToken",
+    "RevokedToken",
     "METADATA"
 ]
 
@@ -1,7 +1,7 @@
 from tus_datos_prueba.models._base import ModelBase, UseCreatedAt
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.orm import relationship
-from sqlalchemy import JSON, UUID as DB_UUID, Boolean, Column, DateTime, Table
+from sqlalchemy import JSON, UUID as DB_UUID, Boolean, Column, DateTime, Index, Table, text
 from sqlalchemy import ForeignKey
 from sqlalchemy import func
 from datetime import datetime
@@ -34,6 +34,9 @@ class Event(UseCreatedAt, ModelBase):
     """
 
     __tablename__ = "events"
+    __table_args__ = (
+        Index("ix_events_active_page", "start_date", "id", postgresql_where=text("active")),
+    )
 
     id: Mapped[UUID] = mapped_column(DB_UUID(as_uuid=True), primary_key=True, default=uuid4)
 
@@ -75,6 +78,9 @@ class Assistant(UseCreatedAt, ModelBase):
     """
 
     __tablename__ = "assistants"
+    __table_args__ = (
+        Index("ix_assistants_page", "created_at", "id"),
+    )
     
     id: Mapped[UUID] = mapped_column(DB_UUID(as_uuid=True), primary_key=True, default=uuid4)
     user_id: Mapped[UUID] = mapped_column(ForeignKey("users.id"), index=True, nullable=True)
@@ -101,6 +107,9 @@ class Session(UseCreatedAt, ModelBase):
     """
 
     __tablename__ = "sessions"
+    __table_args__ = (
+        Index("ix_sessions_event_page", "event_id", "start_date", "id", postgresql_where=text("active")),
+    )
 
     id: Mapped[UUID] = mapped_column(DB_UUID(as_uuid=True), primary_key=True, default=uuid4)
     title: Mapped[str] = mapped_column()
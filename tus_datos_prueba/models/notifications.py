@@ -0,0 +1,48 @@
+from tus_datos_prueba.models._base import ModelBase, UseCreatedAt
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import JSON, UUID as DB_UUID, DateTime, ForeignKey, Index, func, text
+from datetime import datetime
+from uuid import UUID, uuid4
+from enum import IntEnum
+
+
+class NotificationJobStatus(IntEnum):
+    """
+    Bulk notification status
+    """
+
+    RUNNING = 0
+    FINISHED = 1
+    CANCELLED = 2
+    FAILED = 3
+
+
+class NotificationJob(UseCreatedAt, ModelBase):
+    """
+    Progress of an email fan-out to many recipients
+    """
+
+    __tablename__ = "notification_jobs"
+    __table_args__ = (
+        Index("ix_notification_jobs_running", "heartbeat_at", postgresql_where=text("status = 'RUNNING'")),
+    )
+
+    id: Mapped[UUID] = mapped_column(DB_UUID(as_uuid=True), primary_key=True, default=uuid4)
+    subject: Mapped[str] = mapped_column()
+    # everything needed to resume the job in another worker, null for jobs created before
+    body: Mapped[str] = mapped_column(nullable=True)
+    event_id: Mapped[UUID] = mapped_column(ForeignKey("events.id"), nullable=True)
+
+    status: Mapped[NotificationJobStatus] = mapped_column(default=NotificationJobStatus.RUNNING)
+    total: Mapped[int] = mapped_column(nullable=True)
+    sent: Mapped[int] = mapped_column(default=0)
+    failed: Mapped[int] = mapped_column(default=0)
+
+    # first failures only, [{"email": ..., "error": ...}]
+    failures: Mapped[list[dict]] = mapped_column(JSON(none_as_null=True), default=list)
+    finished_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    # runs of the job, each worker that resumes it counts one
+    attempts: Mapped[int] = mapped_column(default=1, server_default="0")
+    # refreshed after each chunk, a RUNNING job with an old heartbeat lost its worker
+    heartbeat_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=True, default=func.now())
@@ -0,0 +1,42 @@
+from tus_datos_prueba.models._base import ModelBase, UseCreatedAt
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import JSON, UUID as DB_UUID, DateTime, Index, text
+from sqlalchemy import func
+from datetime import datetime
+from uuid import UUID, uuid4
+from enum import IntEnum
+
+
+class OutboxStatus(IntEnum):
+    """
+    Outbox delivery status
+    """
+
+    PENDING = 0
+    SENT = 1
+    FAILED = 2
+
+
+class OutboxMessage(UseCreatedAt, ModelBase):
+    """
+    Email written in the same transaction as the change that triggers it,
+    delivered later by the outbox worker
+    """
+
+    __tablename__ = "outbox"
+    __table_args__ = (
+        Index("ix_outbox_pending", "next_attempt_at", postgresql_where=text("status = 'PENDING'")),
+    )
+
+    id: Mapped[UUID] = mapped_column(DB_UUID(as_uuid=True), primary_key=True, default=uuid4)
+
+    subject: Mapped[str] = mapped_column()
+    recipients: Mapped[list[str]] = mapped_column(JSON(none_as_null=True))
+    body: Mapped[str] = mapped_column()
+    html: Mapped[bool] = mapped_column(default=False)
+
+    status: Mapped[OutboxStatus] = mapped_column(default=OutboxStatus.PENDING)
+    attempts: Mapped[int] = mapped_column(default=0)
+    next_attempt_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    last_error: Mapped[str] = mapped_column(nullable=True)
+    sent_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=True)
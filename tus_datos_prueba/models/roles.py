@@ -4,6 +4,8 @@ from sqlalchemy.orm import relationship
 from sqlalchemy import JSON, UUID as DB_UUID
 from sqlalchemy import ForeignKey
 from uuid import UUID, uuid4
+from hashlib import sha256
+import json
 
 
 
@@ -40,3 +42,15 @@ class Role(UseCreatedAt, ModelBase):
     @property
     def permissions_dict(self):
         return {perm.resource: perm.verbs for perm in self.permissions}
+
+    @property
+    def version(self) -> str:
+        return permissions_version(self.permissions_dict)
+
+
+def permissions_version(perms: dict[str, list[str]]) -> str:
+    """
+    Short digest of a permission set, changes whenever a verb is granted or revoked
+    """
+    pairs = sorted((resource, verb) for resource, verbs in perms.items() for verb in verbs)
+    return sha256(json.dumps(pairs).encode()).hexdigest()[:12]
@@ -0,0 +1,42 @@
+from tus_datos_prueba.models._base import ModelBase, UseCreatedAt
+from tus_datos_prueba.models.users import User
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import UUID as DB_UUID, DateTime, ForeignKey, Index
+from sqlalchemy.dialects.postgresql.types import BYTEA
+from datetime import datetime
+from uuid import UUID, uuid4
+
+
+class RefreshToken(UseCreatedAt, ModelBase):
+    """
+    Server side refresh token, only the sha256 of the token is stored.
+    Every refresh rotates the token, all tokens rotated from the same login share a family.
+    """
+
+    __tablename__ = "refresh_tokens"
+
+    id: Mapped[UUID] = mapped_column(DB_UUID(as_uuid=True), primary_key=True, default=uuid4)
+    token_hash: Mapped[bytes] = mapped_column(BYTEA(), unique=True)
+    family_id: Mapped[UUID] = mapped_column(DB_UUID(as_uuid=True), index=True)
+
+    user_id: Mapped[UUID] = mapped_column(ForeignKey("users.id"), index=True)
+    user: Mapped["User"] = relationship()
+
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    revoked_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=True)
+
+
+
+class RevokedToken(UseCreatedAt, ModelBase):
+    """
+    Access token revoked before its expiration, kept until it would have expired
+    """
+
+    __tablename__ = "revoked_tokens"
+    __table_args__ = (
+        # workers load new revocations incrementally by creation time
+        Index("ix_revoked_tokens_created_at", "created_at"),
+    )
+
+    jti: Mapped[str] = mapped_column(primary_key=True)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True)
@@ -2,7 +2,7 @@ from tus_datos_prueba.models._base import UseCreatedAt, ModelBase
 from tus_datos_prueba.models.roles import Role
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.orm import relationship
-from sqlalchemy import JSON, UUID as DB_UUID
+from sqlalchemy import JSON, UUID as DB_UUID, Index, text
 from sqlalchemy.dialects.postgresql.types import BYTEA
 from sqlalchemy import ForeignKey
 from uuid import UUID, uuid4
@@ -13,6 +13,9 @@ class User(UseCreatedAt, ModelBase):
     """
 
     __tablename__ = "users"
+    __table_args__ = (
+        Index("ix_users_active_page", "created_at", "id", postgresql_where=text("active")),
+    )
     
     id: Mapped[UUID] = mapped_column(DB_UUID(as_uuid=True), primary_key=True, default=uuid4)
     email: Mapped[str] = mapped_column(index=True)
@@ -24,6 +27,12 @@ class User(UseCreatedAt, ModelBase):
     meta: Mapped[dict] = mapped_column(JSON(none_as_null=True), nullable=True)
 
     passwords: Mapped[list["UserPassword"]] = relationship(back_populates="user", cascade="all, delete-orphan")
+    # only the active row of the password history
+    current_password: Mapped["UserPassword"] = relationship(
+        primaryjoin="and_(User.id == UserPassword.user_id, UserPassword.active == True)",
+        viewonly=True,
+        uselist=False,
+    )
 
     @property
     def active_password(self):
@@ -40,6 +49,10 @@ class UserPassword(UseCreatedAt, ModelBase):
     """
 
     __tablename__ = "passwords"
+    __table_args__ = (
+        # at most one active password per user
+        Index("ix_passwords_active", "user_id", unique=True, postgresql_where=text("active")),
+    )
 
     id: Mapped[UUID] = mapped_column(DB_UUID(as_uuid=True), primary_key=True, default=uuid4)
     user_id: Mapped[UUID] = mapped_column(ForeignKey("users.id"), index=True)
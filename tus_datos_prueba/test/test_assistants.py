@@ -6,6 +6,7 @@ from tus_datos_prueba.app.adapters.assistants import AssistantQueries, Assistant
 from tus_datos_prueba.app.services.assistants import AssistantService
 from tus_datos_prueba.app.services.events import EventService
 from tus_datos_prueba.app.services.users import UserService
+from tus_datos_prueba.app.services.outbox import OutboxService
 from tus_datos_prueba.utils.jwt import has_permission
 from tus_datos_prueba.app.models.assistants import AssistantResponse
 from tus_datos_prueba.models.events import AssistantType
@@ -26,7 +27,12 @@ def user_service():
     return svc
 
 @pytest.fixture
-def info(assistant_service, event_service, user_service):
+def outbox_service():
+    svc = Mock(spec=OutboxService)
+    return svc
+
+@pytest.fixture
+def info(assistant_service, event_service, user_service, outbox_service):
     return Mock(
         context={
             "session": {
@@ -36,7 +42,8 @@ def info(assistant_service, event_service, user_service):
             },
             "assistant_service": assistant_service,
             "event_service": event_service,
-            "user_service": user_service
+            "user_service": user_service,
+            "outbox_service": outbox_service
         }
     )
 
@@ -0,0 +1,74 @@
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+from uuid import uuid4
+from jwt import decode
+from tus_datos_prueba.utils.cache import TTLCache
+from tus_datos_prueba.utils.jwt import VERIFIED_TOKENS, sign_session, validate_session
+from tus_datos_prueba.utils.jwt.auth import USER_LIVENESS, get_user_role, _on_user_changed
+
+
+def test_ttl_cache_expires_entries():
+    """
+    Test that entries expire after the cache TTL or their own TTL
+    """
+    cache = TTLCache("test_expiry", 10, 60)
+
+    with patch("tus_datos_prueba.utils.cache.time.monotonic", return_value=100):
+        cache.set("a", 1)
+        cache.set("b", 2, ttl=5)
+
+    with patch("tus_datos_prueba.utils.cache.time.monotonic", return_value=110):
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    """
+    Test that a full cache evicts the least recently used entry
+    """
+    cache = TTLCache("test_lru", 2, 60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+@pytest.mark.asyncio
+async def test_user_liveness_is_cached_until_notified():
+    """
+    Test that the user role is read once and read again after a change notification
+    """
+    user_id = uuid4()
+    session = AsyncMock()
+    session.scalar = AsyncMock(return_value=2)
+
+    assert await get_user_role(session, user_id) == 2
+    assert await get_user_role(session, user_id) == 2
+    session.scalar.assert_awaited_once()
+
+    _on_user_changed(str(user_id))
+    session.scalar = AsyncMock(return_value=None)
+
+    assert await get_user_role(session, user_id) is None
+    USER_LIVENESS.clear()
+
+
+def test_verified_token_is_decoded_once():
+    """
+    Test that a token verified before is not decoded again
+    """
+    user = Mock(id=uuid4(), role=Mock(permissions_dict={"events": ["list"]}))
+    token = sign_session(user)
+
+    with patch("tus_datos_prueba.utils.jwt.decode", wraps=decode) as mock_decode:
+        first = validate_session(token)
+        second = validate_session(token)
+
+    mock_decode.assert_called_once()
+    assert first == second
+    assert first["sub"] == str(user.id)
+    VERIFIED_TOKENS.clear()
@@ -0,0 +1,35 @@
+import pytest
+import sqlite3
+from sqlalchemy import exc
+from sqlalchemy.util import greenlet_spawn
+from tus_datos_prueba.utils.db.pool import InstrumentedPool, DB_POOL_CONNECTIONS_METRIC, DB_POOL_TIMEOUTS_METRIC
+
+
+def _connect():
+    return sqlite3.connect(":memory:", check_same_thread=False)
+
+
+@pytest.mark.asyncio
+async def test_pool_reports_usage_and_timeouts():
+    """
+    Test that the pool reports checked out connections and checkout timeouts
+    """
+    pool = InstrumentedPool(_connect, pool_size=1, max_overflow=0, timeout=0.05, logging_name="test")
+    checked_out = DB_POOL_CONNECTIONS_METRIC.labels(pool="test", state="checked_out")
+    timeouts = DB_POOL_TIMEOUTS_METRIC.labels(pool="test")
+
+    def exhaust():
+        conn = pool.connect()
+        assert checked_out._value.get() == 1
+
+        with pytest.raises(exc.TimeoutError):
+            pool.connect()
+
+        conn.close()
+
+    await greenlet_spawn(exhaust)
+
+    assert checked_out._value.get() == 0
+    assert timeouts._value.get() == 1
+    # the label survives engine.dispose()
+    assert pool.recreate()._label == "test"
@@ -1,11 +1,16 @@
 import pytest
 from unittest.mock import AsyncMock, Mock
-from uuid import UUID
+from uuid import UUID, uuid4
 
 from tus_datos_prueba.app.adapters.events import EventQueries, EventMutations
 from tus_datos_prueba.app.services.events import EventService
+from tus_datos_prueba.app.services.users import UserService
+from tus_datos_prueba.app.services.outbox import OutboxService
 from tus_datos_prueba.utils.jwt import has_permission
-from tus_datos_prueba.app.models.events import EventResponse
+from tus_datos_prueba.app.models.events import EventResponse, SearchFreshness
+from tus_datos_prueba.models.events import EventStatus
+from strawberry.types.nodes import InlineFragment, SelectedField
+from tus_datos_prueba.utils.db.pagination import Page
 
 @pytest.fixture
 def event_service():
@@ -13,7 +18,17 @@ def event_service():
     return svc
 
 @pytest.fixture
-def info(event_service):
+def user_service():
+    svc = Mock(spec=UserService)
+    return svc
+
+@pytest.fixture
+def outbox_service():
+    svc = Mock(spec=OutboxService)
+    return svc
+
+@pytest.fixture
+def info(event_service, user_service, outbox_service):
     return Mock(
         context={
             "session": {
@@ -22,7 +37,9 @@ def info(event_service):
                 },
                 "sub": UUID("12345678-1234-5678-1234-567812345678")
             },
-            "event_service": event_service
+            "event_service": event_service,
+            "user_service": user_service,
+            "outbox_service": outbox_service
         }
     )
 
@@ -168,3 +185,60 @@ async def test_event_delete(info):
     info.context["event_service"].get_by_id.assert_awaited_once_with(event_id)
     info.context["event_service"].delete.assert_awaited_once_with(event_obj)
 
+
+@pytest.mark.asyncio
+async def test_event_get_by_ids_keeps_order():
+    """
+    Test that search hits are hydrated in one query and keep the relevance order
+    """
+    first, second, missing = Mock(id=uuid4()), Mock(id=uuid4()), uuid4()
+    session = AsyncMock()
+    session.scalars = AsyncMock(return_value=[first, second])
+
+    events = await EventService(session).get_by_ids([second.id, missing, first.id])
+
+    session.scalars.assert_awaited_once()
+    assert events == [second, first]
+
+@pytest.mark.asyncio
+async def test_event_search(info):
+    """
+    Test that eventSearch pages the hits and skips events that are no longer active
+    """
+    event = Mock(id=uuid4(), title="Event", description="", start_date="", end_date="", status=0, created_by_id=uuid4())
+    hits = Page(items=[event.id, uuid4()], cursors=["c1", "c2"], has_next=True, has_previous=False)
+    info.context["search_event_service"] = Mock(search=AsyncMock(return_value=hits))
+    info.context["event_service"].get_by_ids = AsyncMock(return_value=[event])
+
+    connection = await EventQueries().event_search(info, "evento", size=2)
+
+    info.context["search_event_service"].search.assert_awaited_once_with("evento", {}, 2, None)
+    assert [edge.node.id for edge in connection.edges] == [event.id]
+    assert connection.page_info.has_next_page
+    assert connection.page_info.end_cursor == "c2"
+
+@pytest.mark.asyncio
+async def test_event_search_fast(info):
+    """
+    Test that a fast eventSearch answers from the index, fetching only the requested fields
+    """
+    event_id = uuid4()
+    documents = Page(items=[{"id": str(event_id), "title": "Event", "status": "IN_PROGRESS"}], cursors=["c1"], has_next=False, has_previous=False)
+    info.context["search_event_service"] = Mock(search=AsyncMock(return_value=documents))
+    info.context["event_service"].get_by_ids = AsyncMock()
+    node = SelectedField(name="node", directives={}, arguments={}, selections=[
+        SelectedField(name="title", directives={}, arguments={}, selections=[]),
+        InlineFragment(type_condition="EventResponse", directives={}, selections=[
+            SelectedField(name="status", directives={}, arguments={}, selections=[]),
+        ]),
+    ])
+    info.selected_fields = [SelectedField(name="eventSearch", directives={}, arguments={}, selections=[
+        SelectedField(name="edges", directives={}, arguments={}, selections=[node]),
+    ])]
+
+    connection = await EventQueries().event_search(info, "evento", size=5, freshness=SearchFreshness.FAST)
+
+    info.context["search_event_service"].search.assert_awaited_once_with("evento", {}, 5, None, ["id", "status", "title"])
+    info.context["event_service"].get_by_ids.assert_not_awaited()
+    assert connection.edges[0].node.id == event_id
+    assert connection.edges[0].node.status == EventStatus.IN_PROGRESS
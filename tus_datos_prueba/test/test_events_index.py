@@ -0,0 +1,71 @@
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+from uuid import uuid4
+from tus_datos_prueba.models.events import EventStatus
+from tus_datos_prueba.utils.elastic.events_index import EVENTS_ALIAS, reindex_events
+
+
+def _event():
+    return Mock(
+        id=uuid4(), title="Evento", description="", meta={"location": "Cartagena"}, assitant_limit=10,
+        start_date=datetime(2024, 12, 5, tzinfo=timezone.utc), end_date=datetime(2024, 12, 6, tzinfo=timezone.utc),
+        status=EventStatus.PENDING, created_by_id=uuid4(), active=True, updated_at=None,
+    )
+
+
+def _session(batches):
+    async def partitions():
+        for rows in batches:
+            yield rows
+
+    session = MagicMock()
+    session.stream = AsyncMock(return_value=Mock(partitions=partitions))
+    session.__aenter__ = AsyncMock(return_value=session)
+    session.__aexit__ = AsyncMock(return_value=False)
+    return session
+
+
+@pytest.mark.asyncio
+async def test_reindex_swaps_the_alias():
+    """
+    Test that events are bulk loaded into a new index and the alias moves to it in one update
+    """
+    client = Mock()
+    client.indices = AsyncMock()
+    client.indices.exists_alias = AsyncMock(return_value=True)
+    client.indices.get_alias = AsyncMock(return_value={"events-20240101000000": {}})
+    client.bulk = AsyncMock(return_value={"errors": False, "items": []})
+
+    batches = [[(_event(), 3), (_event(), 0)], [(_event(), 1)]]
+    with patch("tus_datos_prueba.utils.elastic.events_index.new_session", return_value=_session(batches)):
+        index = await reindex_events(client, batch_size=2)
+
+    client.indices.put_index_template.assert_awaited_once()
+    assert client.indices.create.await_args.kwargs["index"] == index
+    assert client.bulk.await_count == 2
+
+    operations = client.bulk.await_args_list[0].kwargs["operations"]
+    assert operations[0] == {"index": {"_index": index, "_id": f"events_{operations[1]['id']}"}}
+    assert operations[1]["status"] == "PENDING" and operations[1]["assistant_count"] == 3
+
+    actions = client.indices.update_aliases.await_args.kwargs["actions"]
+    assert {"add": {"index": index, "alias": EVENTS_ALIAS, "is_write_index": True}} in actions
+    assert {"remove": {"index": "events-20240101000000", "alias": EVENTS_ALIAS}} in actions
+    client.indices.delete.assert_awaited_once_with(index="events-20240101000000")
+
+
+@pytest.mark.asyncio
+async def test_reindex_fails_before_the_swap():
+    """
+    Test that rejected documents stop the reindex and the alias is left alone
+    """
+    client = Mock()
+    client.indices = AsyncMock()
+    client.bulk = AsyncMock(return_value={"errors": True, "items": [{"index": {"status": 400, "error": {"type": "mapper_parsing_exception"}}}]})
+
+    with patch("tus_datos_prueba.utils.elastic.events_index.new_session", return_value=_session([[(_event(), 0)]])):
+        with pytest.raises(RuntimeError):
+            await reindex_events(client)
+
+    client.indices.update_aliases.assert_not_awaited()
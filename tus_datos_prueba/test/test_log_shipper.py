@@ -0,0 +1,123 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from tus_datos_prueba.utils.elastic.shipper import LogShipper
+from tus_datos_prueba.utils.elastic.spool import Spool
+
+
+@pytest.fixture
+def elastic():
+    client = Mock()
+    client.bulk = AsyncMock(side_effect=lambda operations: {
+        "items": [{"index": {"status": 201}} for _ in operations[::2]]
+    })
+    return client
+
+
+@pytest.mark.asyncio
+async def test_ship_flushes_in_bulk(elastic):
+    """
+    Test that queued documents are sent in a single _bulk request
+    """
+    shipper = LogShipper(max_queue=10, batch_size=10, elastic=lambda: elastic)
+
+    for i in range(3):
+        assert shipper.ship("http_logs", {"n": i})
+
+    await shipper.close()
+
+    elastic.bulk.assert_awaited_once()
+    operations = elastic.bulk.await_args.kwargs["operations"]
+    assert operations[0] == {"index": {"_index": "http_logs"}}
+    assert [op["n"] for op in operations[1::2]] == [0, 1, 2]
+
+
+@pytest.mark.asyncio
+async def test_close_flushes_the_partial_batch(elastic):
+    """
+    Test that closing while the worker waits to fill a batch still ships the records it took
+    """
+    shipper = LogShipper(max_queue=10, batch_size=10, flush_interval=60, elastic=lambda: elastic)
+    shipper.start()
+
+    shipper.ship("http_logs", {"n": 0})
+    shipper.ship("http_logs", {"n": 1})
+    # the worker takes both and waits for more
+    await asyncio.sleep(0.05)
+    assert shipper.queue.empty()
+    elastic.bulk.assert_not_awaited()
+
+    await shipper.close()
+
+    elastic.bulk.assert_awaited_once()
+    assert [op["n"] for op in elastic.bulk.await_args.kwargs["operations"][1::2]] == [0, 1]
+
+
+@pytest.mark.asyncio
+async def test_ship_drops_when_full(elastic):
+    """
+    Test that ship never waits and drops documents once the queue is full
+    """
+    shipper = LogShipper(max_queue=2, batch_size=10, elastic=lambda: elastic)
+
+    assert shipper.ship("http_logs", {})
+    assert shipper.ship("http_logs", {})
+    assert not shipper.ship("http_logs", {})
+
+
+@pytest.mark.asyncio
+async def test_ship_samples_over_watermark(elastic):
+    """
+    Test that the sample policy discards documents over the watermark
+    """
+    shipper = LogShipper(max_queue=10, overflow_policy="sample", sample_rate=0, sample_watermark=0.5, elastic=lambda: elastic)
+
+    accepted = [shipper.ship("http_logs", {}) for _ in range(10)]
+
+    assert accepted.count(True) == 5
+
+
+@pytest.mark.asyncio
+async def test_errors_are_never_sampled_nor_dropped(elastic, tmp_path):
+    """
+    Test that error documents skip sampling and are spooled when the queue is full
+    """
+    spool = Spool(str(tmp_path), 1024 * 1024, 1024 * 1024)
+    shipper = LogShipper(max_queue=2, overflow_policy="sample", sample_rate=0, sample_watermark=0.5, elastic=lambda: elastic, spool=spool)
+
+    assert shipper.ship("http_logs", {})
+    assert not shipper.ship("http_logs", {})
+    assert shipper.ship("http_errors", {"n": 1}, id="error-1")
+    # queue full, written to the spool
+    assert shipper.ship("http_errors", {"n": 2}, id="error-2")
+    assert shipper.queue.qsize() == 2
+
+    spool.seal()
+    segment = spool.claim()
+    assert [record for batch in spool.read(segment, 10) for record in batch] == [("http_errors", "error-2", {"n": 2})]
+
+
+@pytest.mark.asyncio
+async def test_spool_and_replay(elastic, tmp_path):
+    """
+    Test that logs are spooled while Elasticsearch is down and replayed once it is healthy
+    """
+    shipper = LogShipper(max_queue=10, elastic=lambda: elastic, spool=Spool(str(tmp_path), 1024 * 1024, 1024 * 1024))
+    ok_bulk = elastic.bulk.side_effect
+    elastic.bulk.side_effect = ConnectionError("down")
+
+    shipper.ship("http_errors", {"n": 1}, id="error-1")
+    await shipper.close()
+
+    assert not shipper.healthy
+    assert list(tmp_path.iterdir())
+
+    elastic.bulk.side_effect = ok_bulk
+    elastic.cluster.health = AsyncMock(return_value={"status": "green"})
+    await shipper.replay()
+
+    assert shipper.healthy
+    operations = elastic.bulk.await_args.kwargs["operations"]
+    assert operations == [{"index": {"_index": "http_errors", "_id": "error-1"}}, {"n": 1}]
+    assert not list(tmp_path.iterdir())
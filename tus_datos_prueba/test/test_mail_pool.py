@@ -0,0 +1,123 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, Mock
+from aiosmtplib import SMTPServerDisconnected
+
+from tus_datos_prueba.utils.mail import MailClient
+from tus_datos_prueba.utils.mail.pool import SMTPPool
+
+
+def smtp_connection():
+    conn = Mock()
+    conn.is_connected = True
+    conn.noop = AsyncMock()
+    conn.quit = AsyncMock()
+    conn.send_message = AsyncMock()
+    conn.close = Mock()
+    return conn
+
+
+@pytest.fixture
+def factory():
+    return AsyncMock(side_effect=lambda: smtp_connection())
+
+
+@pytest.mark.asyncio
+async def test_connection_is_reused(factory):
+    """
+    Test that a released connection is checked with NOOP and reused
+    """
+    pool = SMTPPool(factory, min_size=0, max_size=2, idle_timeout=60)
+
+    async with pool.connection() as first:
+        pass
+    async with pool.connection() as second:
+        pass
+
+    assert first is second
+    factory.assert_awaited_once()
+    second.noop.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_unhealthy_connection_is_replaced(factory):
+    """
+    Test that a connection failing NOOP is discarded and a new one opened
+    """
+    pool = SMTPPool(factory, min_size=0, max_size=2, idle_timeout=60)
+
+    async with pool.connection() as first:
+        first.noop.side_effect = SMTPServerDisconnected("gone")
+    async with pool.connection() as second:
+        pass
+
+    assert first is not second
+    assert factory.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelled_connection_is_not_reused(factory):
+    """
+    Test that a connection interrupted by a cancellation is closed instead of going back to the pool
+    """
+    pool = SMTPPool(factory, min_size=0, max_size=2, idle_timeout=60)
+
+    with pytest.raises(asyncio.CancelledError):
+        async with pool.connection() as first:
+            raise asyncio.CancelledError()
+    async with pool.connection() as second:
+        pass
+
+    assert first is not second
+    first.close.assert_called_once()
+    first.quit.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_noop_closes_the_connection(factory):
+    """
+    Test that cancelling a checkout during the NOOP check closes the idle connection it took
+    """
+    pool = SMTPPool(factory, min_size=1, max_size=1, idle_timeout=60)
+    await pool.fill()
+    idle, _ = pool._idle[0]
+    idle.noop = AsyncMock(side_effect=asyncio.CancelledError())
+
+    with pytest.raises(asyncio.CancelledError):
+        await pool.acquire()
+
+    idle.close.assert_called_once()
+    assert not pool._idle
+    # the slot was given back
+    conn = await pool.acquire()
+    assert conn is not idle
+
+
+@pytest.mark.asyncio
+async def test_checkout_waits_for_max_size(factory):
+    """
+    Test that no more than max_size connections are checked out at once
+    """
+    pool = SMTPPool(factory, min_size=0, max_size=1, idle_timeout=60)
+
+    conn = await pool.acquire()
+    waiter = asyncio.create_task(pool.acquire())
+    await asyncio.sleep(0)
+    assert not waiter.done()
+
+    await pool.release(conn)
+    assert await waiter is conn
+
+
+@pytest.mark.asyncio
+async def test_mail_client_is_lazy(factory):
+    """
+    Test that MailClient only takes a connection when a message is sent
+    """
+    pool = SMTPPool(factory, min_size=0, max_size=1, idle_timeout=60)
+    client = MailClient(pool)
+    factory.assert_not_awaited()
+
+    await client.send_message(Mock())
+
+    factory.assert_awaited_once()
@@ -0,0 +1,81 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+from uuid import uuid4
+from sqlalchemy.dialects import postgresql
+
+from tus_datos_prueba.app.workers.notifications import resume_notification_jobs, run_notification_job
+from tus_datos_prueba.models.notifications import NotificationJob, NotificationJobStatus
+from tus_datos_prueba.config import NOTIFY_JOB_MAX_ATTEMPTS
+
+
+def db_session():
+    session = MagicMock()
+    session.__aenter__ = AsyncMock(return_value=session)
+    session.__aexit__ = AsyncMock(return_value=False)
+    session.commit = AsyncMock()
+    session.rollback = AsyncMock()
+    return session
+
+
+def running_job(**values):
+    job = NotificationJob(
+        id=uuid4(), subject="Session Deleted", body="deleted", event_id=uuid4(), status=NotificationJobStatus.RUNNING,
+        total=None, sent=0, failed=0, failures=[], attempts=1,
+    )
+    for key, value in values.items():
+        setattr(job, key, value)
+    return job
+
+
+@pytest.mark.asyncio
+async def test_job_resumes_after_the_last_chunk():
+    """
+    Test that a job continues after the recipients it already went through and finishes
+    """
+    job = running_job(total=5, sent=2, failed=1)
+    session, reader = db_session(), db_session()
+    session.get = AsyncMock(return_value=job)
+
+    async def partitions():
+        yield ["d@example.com", "e@example.com"]
+
+    reader.stream_scalars = AsyncMock(return_value=Mock(partitions=partitions))
+    mail = Mock(send_message=AsyncMock())
+
+    with patch("tus_datos_prueba.app.workers.notifications.new_session", side_effect=[session, reader]), \
+         patch("tus_datos_prueba.app.workers.notifications.MailClient", return_value=mail), \
+         patch("tus_datos_prueba.app.workers.notifications.get_pool"):
+        await run_notification_job(job.id)
+
+    query = reader.stream_scalars.await_args.args[0]
+    sql = str(query.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+    assert "ORDER BY assistants.id" in sql and "OFFSET 3" in sql
+
+    assert mail.send_message.await_count == 2
+    assert (job.sent, job.failed, job.total) == (4, 1, 5)
+    assert job.status == NotificationJobStatus.FINISHED
+    assert job.finished_at is not None
+
+
+@pytest.mark.asyncio
+async def test_stale_jobs_are_resumed_or_failed():
+    """
+    Test that jobs left RUNNING by a stopped worker are resumed, unless they cannot be
+    """
+    resumable = running_job()
+    legacy = running_job(body=None, event_id=None)
+    exhausted = running_job(attempts=NOTIFY_JOB_MAX_ATTEMPTS)
+    session = db_session()
+
+    with patch("tus_datos_prueba.app.workers.notifications.new_session", return_value=session), \
+         patch("tus_datos_prueba.app.workers.notifications.NotificationService") as service, \
+         patch("tus_datos_prueba.app.workers.notifications.start_notification_job") as start:
+        service.return_value.claim_stale = AsyncMock(return_value=[resumable, legacy, exhausted])
+        await resume_notification_jobs()
+
+    session.commit.assert_awaited_once()
+    start.assert_called_once_with(resumable.id)
+    assert resumable.status == NotificationJobStatus.RUNNING and resumable.attempts == 2
+    assert resumable.heartbeat_at is not None
+    assert legacy.status == NotificationJobStatus.FAILED
+    assert exhausted.status == NotificationJobStatus.FAILED
@@ -0,0 +1,111 @@
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, Mock, patch
+from uuid import uuid4
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+from tus_datos_prueba.models import Event
+from tus_datos_prueba.app.adapters.events import EventQueries
+from tus_datos_prueba.app.services.events import EVENT_PAGE_KEYS
+from tus_datos_prueba.utils.db.pagination import LIST_COUNTS, CountMode, Page, count_rows, decode_cursor, encode_cursor, paginate
+
+
+def test_cursor_round_trip():
+    """
+    Test that cursors decode to the values they encode and bad cursors are rejected
+    """
+    values = (datetime(2024, 12, 5, 10, 30, tzinfo=timezone.utc), uuid4())
+
+    assert decode_cursor(encode_cursor(values), EVENT_PAGE_KEYS) == values
+
+    with pytest.raises(ValueError):
+        decode_cursor("not a cursor", EVENT_PAGE_KEYS)
+
+
+@pytest.mark.asyncio
+async def test_paginate_fetches_one_extra_row():
+    """
+    Test that a page seeks after the cursor and fetches one extra row to know if there is a next page
+    """
+    rows = [Mock(start_date=datetime(2024, 12, day, tzinfo=timezone.utc), id=uuid4()) for day in (1, 2, 3)]
+    session = AsyncMock()
+    session.scalars = AsyncMock(return_value=rows)
+
+    after = encode_cursor((datetime(2024, 11, 30, tzinfo=timezone.utc), uuid4()))
+    page = await paginate(session, select(Event), EVENT_PAGE_KEYS, 2, after)
+
+    query = session.scalars.await_args.args[0]
+    sql = str(query.compile(dialect=postgresql.dialect()))
+    assert "(events.start_date, events.id) >" in sql
+    assert "ORDER BY events.start_date, events.id" in sql
+
+    assert page.items == rows[:2]
+    assert page.has_next and page.has_previous
+    assert decode_cursor(page.cursors[-1], EVENT_PAGE_KEYS) == (rows[1].start_date, rows[1].id)
+
+
+@pytest.mark.asyncio
+async def test_event_connection():
+    """
+    Test that eventConnection builds edges and page info from a service page
+    """
+    event = Mock(id=uuid4(), title="Event", description="", start_date="", end_date="", status=0, created_by_id=uuid4())
+    info = Mock()
+    info.context = {
+        "session": {"sub": str(uuid4()), "perms": {"events": ["list"]}},
+        "event_service": Mock(page_events=AsyncMock(return_value=Page(items=[event], cursors=["c1"], has_next=False, has_previous=False))),
+    }
+
+    connection = await EventQueries().event_connection(info, first=10)
+
+    info.context["event_service"].page_events.assert_awaited_once_with(10, None)
+    assert connection.edges[0].node.id == event.id
+    assert connection.page_info.end_cursor == "c1"
+    assert not connection.page_info.has_next_page
+
+    with pytest.raises(AssertionError):
+        await EventQueries().event_connection(info, first=1000)
+
+
+@pytest.mark.asyncio
+async def test_count_rows_estimated():
+    """
+    Test that counts are estimated from the planner and cached
+    """
+    LIST_COUNTS.clear()
+    session = AsyncMock()
+
+    # unfiltered table, the row estimate of the table is enough
+    with patch("tus_datos_prueba.utils.db.pagination.estimate_rows", AsyncMock(return_value=1200)) as estimate_rows:
+        count = await count_rows(session, select(Event))
+    estimate_rows.assert_awaited_once_with(session, "events")
+    assert (count.value, count.mode) == (1200, CountMode.ESTIMATED)
+
+    # filtered, asks the planner; the second time comes from the cache
+    with patch("tus_datos_prueba.utils.db.pagination.estimate_query_rows", AsyncMock(return_value=40)) as estimate_query_rows:
+        await count_rows(session, select(Event).where(Event.active))
+        count = await count_rows(session, select(Event).where(Event.active))
+    estimate_query_rows.assert_awaited_once()
+    assert count.value == 40
+    session.scalar.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_count_rows_exact_is_capped():
+    """
+    Test that exact counts stop at LIST_COUNT_EXACT_CAP
+    """
+    LIST_COUNTS.clear()
+    session = AsyncMock()
+
+    with patch("tus_datos_prueba.utils.db.pagination.LIST_COUNT_EXACT_CAP", 100):
+        session.scalar = AsyncMock(return_value=101)
+        count = await count_rows(session, select(Event).where(Event.active), exact=True)
+        assert (count.value, count.mode) == (100, CountMode.CAPPED)
+
+        session.scalar = AsyncMock(return_value=7)
+        count = await count_rows(session, select(Event).where(~Event.active), exact=True)
+        assert (count.value, count.mode) == (7, CountMode.EXACT)
+
+    sql = str(session.scalar.await_args.args[0].compile(dialect=postgresql.dialect()))
+    assert "count(*)" in sql and "LIMIT" in sql
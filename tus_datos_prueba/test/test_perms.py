@@ -0,0 +1,52 @@
+import pytest
+from unittest.mock import Mock, patch
+from uuid import uuid4
+from fastapi import HTTPException
+from tus_datos_prueba.utils.jwt import has_permission, sign_session, validate_session
+from tus_datos_prueba.utils.jwt.perms import PermissionRegistry
+from tus_datos_prueba.models.roles import permissions_version
+
+ROLES = {
+    1: {"events": ["create", "list"], "user": ["get"]},
+    2: {"events": ["list"]},
+}
+
+
+@pytest.fixture
+def registry():
+    registry = PermissionRegistry(ROLES)
+    with patch("tus_datos_prueba.utils.jwt.get_registry", return_value=registry):
+        yield registry
+
+
+def test_compact_token_permissions(registry):
+    """
+    Test that a compact token carries the role permissions as a bitmask
+    """
+    user = Mock(id=uuid4(), role_id=2, role=Mock(permissions_dict=ROLES[2], version=permissions_version(ROLES[2])))
+    token = validate_session(sign_session(user, registry))
+
+    assert "perms" not in token
+    assert token["pv"] == registry.version
+    assert token["rv"] == registry.role_versions[2]
+
+    has_permission(token, "events", "list")
+    with pytest.raises(HTTPException):
+        has_permission(token, "events", "create")
+    with pytest.raises(HTTPException):
+        has_permission(token, "roles", "list")
+
+
+def test_compact_token_rejected_with_another_registry(registry):
+    """
+    Test that a compact token is rejected once the permission registry changed
+    """
+    user = Mock(id=uuid4(), role_id=1, role=Mock(permissions_dict=ROLES[1], version=permissions_version(ROLES[1])))
+    token = validate_session(sign_session(user, registry))
+
+    other = PermissionRegistry({**ROLES, 3: {"roles": ["list"]}})
+    assert other.version != registry.version
+
+    with patch("tus_datos_prueba.utils.jwt.get_registry", return_value=other):
+        with pytest.raises(HTTPException):
+            has_permission(token, "events", "create")
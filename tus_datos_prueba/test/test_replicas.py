@@ -0,0 +1,77 @@
+import pytest
+import time
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+from strawberry import Schema
+from tus_datos_prueba.app.routes.graphql import Queries, Mutations, GraphQLContext, ReplicaRouting
+from tus_datos_prueba.utils.db.replicas import Replica, STICKY, STICKY_CHANNEL, pick_replica, probe_replicas
+from tus_datos_prueba.config import DB_REPLICA_MAX_LAG
+
+schema = Schema(Queries, Mutations, extensions=[ReplicaRouting])
+
+
+def test_pick_replica_skips_lagging_replicas():
+    """
+    Test that only replicas within the lag limit are picked
+    """
+    healthy, lagging, down = Replica("a", Mock()), Replica("b", Mock()), Replica("c", Mock())
+    for replica, lag in ((healthy, 0), (lagging, DB_REPLICA_MAX_LAG + 1), (down, None)):
+        replica.lag = lag
+        replica.checked_at = time.monotonic()
+
+    with patch("tus_datos_prueba.utils.db.replicas.__REPLICAS", [healthy, lagging, down]):
+        assert pick_replica() is healthy.engine
+
+    with patch("tus_datos_prueba.utils.db.replicas.__REPLICAS", [lagging, down]):
+        assert pick_replica() is None
+
+
+@pytest.mark.asyncio
+async def test_queries_read_from_replica_until_a_mutation():
+    """
+    Test that queries read from a replica until the same user runs a mutation
+    """
+    context = GraphQLContext({"sub": "user-1", "perms": {}})
+    await schema.execute("{ ping }", context_value=context)
+    assert context.read_only
+
+    session = AsyncMock()
+    with patch("tus_datos_prueba.app.routes.graphql.new_session", return_value=session), \
+         patch("tus_datos_prueba.app.routes.graphql.notify", new=AsyncMock()) as mock_notify:
+        await schema.execute("mutation { userDelete(id: \"6b4c0c4e-8a3a-4a0e-9a52-0f8f1d9f2a11\") }", context_value=GraphQLContext({"sub": "user-1", "perms": {}}))
+
+    # sent through the mutation's session, no second session or commit
+    mock_notify.assert_awaited_once_with(session, STICKY_CHANNEL, "user-1")
+    session.commit.assert_not_awaited()
+
+    context = GraphQLContext({"sub": "user-1", "perms": {}})
+    await schema.execute("{ ping }", context_value=context)
+    assert not context.read_only
+    STICKY.clear()
+
+
+@pytest.mark.asyncio
+async def test_probe_marks_stale_replicas_unhealthy():
+    """
+    Test that equal LSNs only count as no lag while the replica streams from the primary
+    """
+    streaming, disconnected, primary = Replica("a", Mock()), Replica("b", Mock()), Replica("c", Mock())
+    statuses = {
+        streaming: Mock(in_recovery=True, streaming=True, lag=0),
+        disconnected: Mock(in_recovery=True, streaming=False, lag=0),
+        primary: Mock(in_recovery=False, streaming=False, lag=0),
+    }
+
+    def connect(engine):
+        replica = next(replica for replica in statuses if replica.engine is engine)
+        session = MagicMock()
+        session.__aenter__.return_value = session
+        session.execute = AsyncMock(return_value=Mock(one=Mock(return_value=statuses[replica])))
+        return session
+
+    with patch("tus_datos_prueba.utils.db.replicas.__REPLICAS", list(statuses)), \
+         patch("tus_datos_prueba.utils.db.replicas.AsyncSession", side_effect=connect):
+        await probe_replicas()
+
+    assert streaming.healthy
+    assert not disconnected.healthy
+    assert not primary.healthy
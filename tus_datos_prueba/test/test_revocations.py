@@ -0,0 +1,85 @@
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy.dialects import postgresql
+from uuid import uuid4
+from tus_datos_prueba.utils.bloom import BloomFilter
+from tus_datos_prueba.app.models.users import RefreshClaim
+from tus_datos_prueba.app.routes.users import logout
+from tus_datos_prueba.utils.jwt import sign_session
+from tus_datos_prueba.utils.jwt.revocations import RevocationList
+
+
+def test_bloom_filter_has_no_false_negatives():
+    """
+    Test that the bloom filter finds every added item and keeps false positives near its error rate
+    """
+    bloom = BloomFilter(1000, 0.01)
+    items = [uuid4().hex for _ in range(1000)]
+    for item in items:
+        bloom.add(item)
+
+    assert all(item in bloom for item in items)
+    false_positives = sum(uuid4().hex in bloom for _ in range(10000))
+    assert false_positives < 300
+
+
+@pytest.mark.asyncio
+async def test_revocation_list_skips_database_for_unknown_jti():
+    """
+    Test that a jti missing from the filter is not looked up in the database
+    """
+    revocations = RevocationList(100, 0.01)
+    revoked = uuid4().hex
+
+    session = AsyncMock()
+    session.scalar = AsyncMock(return_value=0)
+    session.execute = AsyncMock(return_value=[])
+    await revocations.refresh(session)
+    revocations.add(revoked)
+
+    session.scalar = AsyncMock(return_value=True)
+    assert not await revocations.is_revoked(session, uuid4().hex)
+    session.scalar.assert_not_awaited()
+
+    assert await revocations.is_revoked(session, revoked)
+    session.scalar.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_revocation_list_checks_database_while_stale():
+    """
+    Test that every jti is looked up in the database while the filter is stale
+    """
+    revocations = RevocationList(100, 0.01)
+    session = AsyncMock()
+    session.scalar = AsyncMock(return_value=False)
+
+    assert not await revocations.is_revoked(session, uuid4().hex)
+    session.scalar.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_logout_twice_with_the_same_token():
+    """
+    Test that logging out twice with the same token does not fail on the revoked jti
+    """
+    user = Mock(id=uuid4(), role=Mock(permissions_dict={}))
+    token = sign_session(user)
+    session = AsyncMock()
+    session.add = Mock()
+    claim = RefreshClaim(refresh_token="refresh")
+    creds = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+    with patch("tus_datos_prueba.app.routes.users.RefreshTokenService") as service, \
+         patch("tus_datos_prueba.utils.jwt.revocations.notify", AsyncMock()):
+        service.return_value.revoke = AsyncMock()
+        await logout(session, claim, creds)
+        await logout(session, claim, creds)
+
+    # the second insert of the jti is a no-op instead of a primary key violation
+    session.add.assert_not_called()
+    assert session.execute.await_count == 2
+    for call in session.execute.await_args_list:
+        sql = str(call.args[0].compile(dialect=postgresql.dialect()))
+        assert "INSERT INTO revoked_tokens" in sql and "ON CONFLICT (jti) DO NOTHING" in sql
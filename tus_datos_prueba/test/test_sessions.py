@@ -1,5 +1,5 @@
 import pytest
-from unittest.mock import AsyncMock, Mock
+from unittest.mock import AsyncMock, Mock, patch
 from uuid import UUID
 from datetime import datetime
 
@@ -7,6 +7,9 @@ from tus_datos_prueba.app.adapters.sessions import SessionQueries, SessionMutati
 from tus_datos_prueba.app.services.sessions import SessionService
 from tus_datos_prueba.app.services.events import EventService
 from tus_datos_prueba.app.services.assistants import AssistantService
+from tus_datos_prueba.app.services.users import UserService
+from tus_datos_prueba.app.services.outbox import OutboxService
+from tus_datos_prueba.app.services.notifications import NotificationService
 from tus_datos_prueba.utils.jwt import has_permission
 from tus_datos_prueba.app.models.sessions import SessionResponse
 from tus_datos_prueba.models.events import EventStatus, AssistantType
@@ -31,7 +34,25 @@ def assistant_service():
 
 
 @pytest.fixture
-def info(session_service, event_service, assistant_service):
+def user_service():
+    svc = Mock(spec=UserService)
+    return svc
+
+
+@pytest.fixture
+def outbox_service():
+    svc = Mock(spec=OutboxService)
+    return svc
+
+
+@pytest.fixture
+def notification_service():
+    svc = Mock(spec=NotificationService)
+    return svc
+
+
+@pytest.fixture
+def info(session_service, event_service, assistant_service, user_service, outbox_service, notification_service):
     return Mock(
         context={
             "session": {
@@ -41,7 +62,10 @@ def info(session_service, event_service, assistant_service):
             },
             "session_service": session_service,
             "event_service": event_service,
-            "assistant_service": assistant_service
+            "assistant_service": assistant_service,
+            "user_service": user_service,
+            "outbox_service": outbox_service,
+            "notification_service": notification_service
         }
     )
 
@@ -151,9 +175,12 @@ async def test_session_update(info):
 
 
 @pytest.mark.asyncio
-async def test_session_delete(info):
+@patch('tus_datos_prueba.app.adapters.sessions.start_notification_job')
+async def test_session_delete(mock_start_notification_job, info):
     """
     Test deleting a session via SessionMutations.session_delete
+
+    The notification fan-out runs in background, the mutation returns the job handle.
     """
     has_permission(info.context["session"], "assistants", "delete")
 
@@ -161,11 +188,23 @@ async def test_session_delete(info):
     session_mock.event.active = True
     session_mock.event.status = EventStatus.IN_PROGRESS
 
+    job_id = UUID("87654321-4321-8765-4321-876543218765")
+    job_mock = Mock(id=job_id, total=None, sent=0, failed=0, failures=[])
+
     info.context["session_service"].get_by_id = AsyncMock(return_value=session_mock)
     info.context["session_service"].delete_session = AsyncMock()
+    info.context["notification_service"].create_job = AsyncMock(return_value=job_mock)
 
     mutation = SessionMutations()
     result = await mutation.session_delete(info, id=UUID("12345678-1234-5678-1234-567812345678"))
 
-    assert result == "Session deleted successfully."
+    assert result.id == job_id
     info.context["session_service"].delete_session.assert_awaited_once()
+    mock_start_notification_job.assert_called_once()
+    assert mock_start_notification_job.call_args.args[0] == job_id
+    # the job row keeps what a resumed job needs
+    info.context["notification_service"].create_job.assert_awaited_once_with(
+        "Session Deleted",
+        "The session '%s' for the event '%s' has been deleted." % (session_mock.title, session_mock.event.title),
+        session_mock.event.id,
+    )
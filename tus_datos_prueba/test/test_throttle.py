@@ -0,0 +1,60 @@
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+from fastapi import HTTPException
+from tus_datos_prueba.utils.throttle import TokenBucket
+from tus_datos_prueba.app.routes.users import login
+from tus_datos_prueba.app.models.users import LoginClaim
+
+
+def test_token_bucket_refills():
+    """
+    Test that a bucket rejects once empty and refills at its rate
+    """
+    bucket = TokenBucket("test_refill", 2, 1, 10)
+
+    with patch("tus_datos_prueba.utils.throttle.time.monotonic", return_value=100):
+        assert bucket.acquire("a")
+        assert bucket.acquire("a")
+        assert not bucket.acquire("a")
+        assert bucket.acquire("b")
+        assert bucket.retry_after("a") == 1
+
+    with patch("tus_datos_prueba.utils.throttle.time.monotonic", return_value=101):
+        assert bucket.acquire("a")
+
+
+def test_token_bucket_is_bounded():
+    """
+    Test that the limiter keeps at most maxsize buckets, forgetting the least recently used
+    """
+    bucket = TokenBucket("test_bounded", 1, 0.001, 2)
+    for key in "abc":
+        bucket.acquire(key)
+
+    assert len(bucket._buckets) == 2
+    # the least recently used key was forgotten
+    assert bucket.acquire("a")
+
+
+@pytest.mark.asyncio
+@patch("tus_datos_prueba.app.routes.users.LOGIN_ACCOUNT_THROTTLE", TokenBucket("test_account", 2, 0.001, 10))
+@patch("tus_datos_prueba.app.routes.users.LOGIN_IP_THROTTLE", TokenBucket("test_ip", 100, 0.001, 10))
+@patch("tus_datos_prueba.app.routes.users.UserService")
+async def test_login_rejects_before_hashing(mock_service):
+    """
+    Test that a throttled login answers 429 before the password is hashed
+    """
+    mock_service.return_value.login = AsyncMock(return_value=None)
+    request = Mock(client=Mock(host="10.0.0.1"))
+    claim = LoginClaim(email="victim@example.com", password="wrong")
+
+    for _ in range(2):
+        with pytest.raises(HTTPException) as err:
+            await login(AsyncMock(), request, claim)
+        assert err.value.status_code == 401
+
+    with pytest.raises(HTTPException) as err:
+        await login(AsyncMock(), request, claim)
+
+    assert err.value.status_code == 429
+    assert mock_service.return_value.login.await_count == 2
@@ -0,0 +1,63 @@
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+from uuid import uuid4
+from fastapi import HTTPException
+from sqlalchemy.dialects import postgresql
+from tus_datos_prueba.app.routes.users import refresh
+from tus_datos_prueba.app.models.users import RefreshClaim
+from tus_datos_prueba.app.services.tokens import RefreshTokenService
+
+
+@pytest.fixture
+def service():
+    with patch("tus_datos_prueba.app.routes.users.RefreshTokenService") as mock_service:
+        yield mock_service.return_value
+
+
+@pytest.mark.asyncio
+@patch("tus_datos_prueba.app.routes.users.sign_session", return_value="access")
+async def test_refresh_rotates_token(mock_sign_session, service):
+    """
+    Test that a refresh rotates the refresh token and signs a new access token
+    """
+    stored = Mock(user=Mock(id=uuid4()))
+    service.get_active = AsyncMock(return_value=stored)
+    service.rotate = AsyncMock(return_value="next")
+
+    pair = await refresh(AsyncMock(), RefreshClaim(refresh_token="current"))
+
+    service.get_active.assert_awaited_once_with("current")
+    service.rotate.assert_awaited_once_with(stored)
+    mock_sign_session.assert_called_once_with(stored.user, None)
+    assert pair.access_token == "access"
+    assert pair.refresh_token == "next"
+
+
+@pytest.mark.asyncio
+async def test_refresh_rejects_revoked_token(service):
+    """
+    Test that a revoked or unknown refresh token is rejected with 401
+    """
+    service.get_active = AsyncMock(return_value=None)
+    service.rotate = AsyncMock()
+
+    with pytest.raises(HTTPException) as err:
+        await refresh(AsyncMock(), RefreshClaim(refresh_token="reused"))
+
+    assert err.value.status_code == 401
+    service.rotate.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_get_active_joins_users_once():
+    """
+    Test that the token lookup loads the user from the join it filters on
+    """
+    session = AsyncMock()
+    session.scalars = AsyncMock(return_value=Mock(unique=Mock(return_value=Mock(one_or_none=Mock(return_value=None)))))
+
+    assert await RefreshTokenService(session).get_active("token") is None
+
+    sql = str(session.scalars.await_args.args[0].compile(dialect=postgresql.dialect()))
+    assert sql.count("JOIN users") == 1
+    assert "JOIN roles" in sql
@@ -1,10 +1,12 @@
 import pytest
 from unittest.mock import AsyncMock, Mock, call, patch
 from uuid import UUID
+from sqlalchemy.dialects import postgresql
 
 from tus_datos_prueba.app.adapters.users import UserQueries, UserMutations
 from tus_datos_prueba.app.services.users import UserService
 from tus_datos_prueba.app.services.roles import RoleService
+from tus_datos_prueba.app.services.outbox import OutboxService
 from tus_datos_prueba.utils.jwt import has_permission
 
 @pytest.fixture
@@ -18,7 +20,12 @@ def role_service():
     return svc
 
 @pytest.fixture
-def info(user_service, role_service):
+def outbox_service():
+    svc = Mock(spec=OutboxService)
+    return svc
+
+@pytest.fixture
+def info(user_service, role_service, outbox_service):
     return Mock(
         context={
             "session": {
@@ -27,7 +34,8 @@ def info(user_service, role_service):
                 }
             },
             "user_service": user_service,
-            "role_service": role_service
+            "role_service": role_service,
+            "outbox_service": outbox_service
         }
     )
 
@@ -93,4 +101,75 @@ async def test_user_create(mock_has_permission, info):
 
     # Verificar que get_id_by_slug fue llamado con 'user' y luego con 'administrator'
     expected_calls = [call(role), call('administrator')]
-    info.context["role_service"].get_id_by_slug.assert_has_awaits(expected_calls)
\ No newline at end of file
+    info.context["role_service"].get_id_by_slug.assert_has_awaits(expected_calls)
+def _login_session(users):
+    session = AsyncMock()
+    session.scalars = AsyncMock(return_value=Mock(unique=Mock(return_value=Mock(first=Mock(return_value=users[0] if users else None)))))
+    return session
+
+@pytest.mark.asyncio
+@patch('tus_datos_prueba.app.services.users.verify_password_async', new_callable=AsyncMock)
+async def test_login_inactive_user(mock_verify):
+    """
+    Test that an inactive user cannot log in
+
+    Ensures that:
+    - The query only selects active users.
+    - The password is never checked.
+    """
+    session = _login_session([])
+
+    assert await UserService(session).login("admin@admin.com", "password") is None
+
+    sql = str(session.scalars.await_args.args[0].compile(dialect=postgresql.dialect()))
+    assert "users.active = true" in sql
+    mock_verify.assert_not_awaited()
+
+@pytest.mark.asyncio
+@patch('tus_datos_prueba.app.services.users.verify_password_async', new_callable=AsyncMock, return_value=True)
+async def test_login_active_user(mock_verify):
+    """
+    Test that an active user logs in with a single query
+
+    Ensures that:
+    - The user, its active password and the role permissions come from one statement.
+    - The password is checked against the active hash.
+    """
+    user = Mock(current_password=Mock(password="hash"))
+    session = _login_session([user])
+
+    assert await UserService(session).login("admin@admin.com", "password") is user
+
+    session.scalars.assert_awaited_once()
+    sql = str(session.scalars.await_args.args[0].compile(dialect=postgresql.dialect()))
+    assert "JOIN passwords" in sql and "passwords_1.active" in sql
+    assert "JOIN roles" in sql
+    mock_verify.assert_awaited_once_with("password", "hash")
+
+@pytest.mark.asyncio
+@patch('tus_datos_prueba.app.services.users.create_password_async', new_callable=AsyncMock, return_value="new-hash")
+async def test_change_password_deactivates_previous_hash(mock_create_password):
+    """
+    Test that changing a password deactivates the previous hash before adding the new one
+
+    Ensures that:
+    - The user row is locked first.
+    - The active password is deactivated.
+    - The new hash is added and committed after that.
+    """
+    # one parent mock records the order of the session calls
+    calls = Mock(execute=AsyncMock(), add=Mock(), commit=AsyncMock())
+    session = AsyncMock(execute=calls.execute, add=calls.add, commit=calls.commit)
+    user = Mock(id=UUID("12345678-1234-5678-1234-567812345678"))
+
+    await UserService(session).change_password(user, "N3w-password")
+
+    assert [name for name, _, _ in calls.mock_calls] == ["execute", "execute", "add", "commit"]
+
+    lock, deactivate = (str(c.args[0].compile(dialect=postgresql.dialect())) for c in session.execute.await_args_list)
+    assert "FOR UPDATE" in lock
+    assert deactivate.startswith("UPDATE passwords SET active=")
+    assert "passwords.active = true" in deactivate
+
+    added = session.add.call_args.args[0]
+    assert added.user_id == user.id and added.password == "new-hash"
@@ -0,0 +1,32 @@
+import math
+from hashlib import sha256
+
+
+class BloomFilter:
+    """
+    Set membership with false positives (about `error_rate`) and no false negatives
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        # double hashing, k positions out of a single digest
+        digest = sha256(item.encode()).digest()
+        a = int.from_bytes(digest[:8], "little")
+        b = int.from_bytes(digest[8:16], "little") | 1
+        for i in range(self.hashes):
+            yield (a + i * b) % self.size
+
+    def add(self, item: str):
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[position >> 3] & 1 << (position & 7) for position in self._positions(item))
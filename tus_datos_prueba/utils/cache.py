@@ -0,0 +1,65 @@
+import time
+from collections import OrderedDict
+from typing import Any, Generic, Hashable, TypeVar
+from prometheus_client import Counter
+
+CACHE_REQUESTS_METRIC = Counter("cache_requests", "In-process cache lookups", labelnames=('cache', 'result'))
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+_MISSING = object()
+
+
+class TTLCache(Generic[K, V]):
+    """
+    Bounded in-process cache, least recently used entries are evicted first
+    and every entry expires after `ttl` seconds (or at its own `expires_at`).
+    """
+
+    def __init__(self, name: str, maxsize: int, ttl: float):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._hits = CACHE_REQUESTS_METRIC.labels(cache=name, result="hit")
+        self._misses = CACHE_REQUESTS_METRIC.labels(cache=name, result="miss")
+
+    def get(self, key: K, default: Any = None) -> V | Any:
+        entry = self._entries.get(key, _MISSING)
+        if entry is _MISSING:
+            self._misses.inc()
+            return default
+
+        deadline, value = entry
+        if deadline <= time.monotonic():
+            del self._entries[key]
+            self._misses.inc()
+            return default
+
+        self._entries.move_to_end(key)
+        self._hits.inc()
+        return value
+
+    def set(self, key: K, value: V, ttl: float | None = None, expires_at: float | None = None):
+        """
+        `expires_at` is a unix timestamp, the entry never outlives `ttl` anyway
+        """
+        now = time.monotonic()
+        deadline = now + (self.ttl if ttl is None else ttl)
+        if expires_at is not None:
+            deadline = min(deadline, now + expires_at - time.time())
+
+        self._entries[key] = (deadline, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: K):
+        self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -1,14 +1,43 @@
 from typing import Annotated
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from tus_datos_prueba.config import POSTGRES_URI, IS_DEBUG
+from tus_datos_prueba.utils.db.pool import InstrumentedPool
+from tus_datos_prueba.utils.db.replicas import pick_replica
+from tus_datos_prueba.config import (
+    POSTGRES_URI,
+    IS_DEBUG,
+    DB_POOL_SIZE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_TIMEOUT,
+    DB_POOL_RECYCLE,
+    DB_POOL_PRE_PING,
+)
 
-__CONN = create_async_engine(POSTGRES_URI, echo=IS_DEBUG)
+__CONN = create_async_engine(
+    POSTGRES_URI,
+    echo=IS_DEBUG,
+    poolclass=InstrumentedPool,
+    pool_logging_name="primary",
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    pool_recycle=DB_POOL_RECYCLE,
+    pool_pre_ping=DB_POOL_PRE_PING,
+)
 
 
-async def get_session() -> AsyncSession:
+def new_session(readonly: bool = False, **options) -> AsyncSession:
+    """
+    `readonly` sessions use a replica when one is within the lag limit
+    """
     global __CONN
-    async with AsyncSession(__CONN) as session:
+    if readonly and (replica := pick_replica()) is not None:
+        return AsyncSession(replica, **options)
+    return AsyncSession(__CONN, **options)
+
+
+async def get_session() -> AsyncSession:
+    async with new_session() as session:
         yield session
 
 
@@ -0,0 +1,52 @@
+import asyncio
+from collections import defaultdict
+from typing import Callable
+from psycopg import AsyncConnection, sql
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from tus_datos_prueba.config import POSTGRES_DSN
+
+# channel -> callbacks(payload), payload None means notifications may have been missed
+__SUBSCRIBERS: dict[str, list[Callable[[str | None], None]]] = defaultdict(list)
+
+
+def subscribe(channel: str, callback: Callable[[str | None], None]):
+    __SUBSCRIBERS[channel].append(callback)
+
+
+async def notify(session: AsyncSession, channel: str, payload: str):
+    """
+    Queue a NOTIFY in the session transaction, listeners get it once it commits
+    """
+    await session.execute(select(func.pg_notify(channel, payload)))
+
+
+def _dispatch(channel: str, payload: str | None):
+    for callback in __SUBSCRIBERS[channel]:
+        try:
+            callback(payload)
+        except Exception as err:
+            print(f"Listener of {channel} failed: {err}")
+
+
+async def run_listener(retry: float = 5):
+    """
+    LISTEN on every subscribed channel with one dedicated connection, reconnecting on errors
+    """
+    while True:
+        try:
+            async with await AsyncConnection.connect(POSTGRES_DSN, autocommit=True) as conn:
+                for channel in __SUBSCRIBERS:
+                    await conn.execute(sql.SQL("LISTEN {}").format(sql.Identifier(channel)))
+
+                # anything sent while disconnected is lost
+                for channel in __SUBSCRIBERS:
+                    _dispatch(channel, None)
+
+                async for message in conn.notifies():
+                    _dispatch(message.channel, message.payload)
+        except asyncio.CancelledError:
+            raise
+        except Exception as err:
+            print(f"Postgres listener disconnected: {err}")
+        await asyncio.sleep(retry)
@@ -0,0 +1,129 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from functools import partial
+from typing import Any, Awaitable, Callable, Generic, TypeVar
+from uuid import UUID
+from sqlalchemy import Select, Table, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+from tus_datos_prueba.utils.cache import TTLCache
+from tus_datos_prueba.utils.db.stats import estimate_query_rows, estimate_rows
+from tus_datos_prueba.config import PAGE_SIZE_MAX, LIST_COUNT_CACHE_TTL, LIST_COUNT_EXACT_CAP
+
+T = TypeVar("T")
+
+
+class CountMode(Enum):
+    EXACT = "exact"
+    # exact count stopped at LIST_COUNT_EXACT_CAP, the list has at least that many rows
+    CAPPED = "capped"
+    ESTIMATED = "estimated"
+
+
+@dataclass
+class Count:
+    value: int
+    mode: CountMode
+
+
+# (exact, statement, parameters) -> Count
+LIST_COUNTS: TTLCache[tuple, Count] = TTLCache("list_counts", 1000, LIST_COUNT_CACHE_TTL)
+
+
+@dataclass
+class Page(Generic[T]):
+    items: list[T]
+    cursors: list[str]
+    has_next: bool
+    has_previous: bool
+    # count of the whole list, not only this page; only queried if asked for
+    count: Callable[[bool], Awaitable[Count]] | None = None
+
+
+def page_size(limit: int | None) -> int:
+    """
+    Rows per page, never more than PAGE_SIZE_MAX
+    """
+    return PAGE_SIZE_MAX if limit is None else min(limit, PAGE_SIZE_MAX)
+
+
+def _dump(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def _load(value: Any, python_type: type) -> Any:
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is UUID:
+        return UUID(value)
+    return python_type(value)
+
+
+def encode_cursor(values: tuple) -> str:
+    return urlsafe_b64encode(json.dumps([_dump(value) for value in values]).encode()).decode()
+
+
+def decode_cursor(cursor: str, keys: tuple[InstrumentedAttribute, ...]) -> tuple:
+    try:
+        values = json.loads(urlsafe_b64decode(cursor.encode()))
+        assert isinstance(values, list) and len(values) == len(keys)
+        return tuple(_load(value, key.type.python_type) for value, key in zip(values, keys))
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+async def count_rows(session: AsyncSession, query: Select, exact: bool = False) -> Count:
+    """
+    Rows of `query`. Estimated from the planner unless `exact`, exact counts stop at LIST_COUNT_EXACT_CAP
+    """
+    compiled = query.compile()
+    key = (exact, str(compiled), tuple(sorted((name, str(value)) for name, value in compiled.params.items())))
+    count = LIST_COUNTS.get(key)
+    if count is not None:
+        return count
+
+    if exact:
+        limited = query.order_by(None).limit(LIST_COUNT_EXACT_CAP + 1).subquery()
+        value = await session.scalar(select(func.count()).select_from(limited))
+        count = Count(value, CountMode.EXACT) if value <= LIST_COUNT_EXACT_CAP else Count(LIST_COUNT_EXACT_CAP, CountMode.CAPPED)
+    else:
+        value = None
+        froms = query.get_final_froms()
+        # an unfiltered table is the table row estimate, no need to plan anything
+        if query.whereclause is None and len(froms) == 1 and isinstance(froms[0], Table):
+            value = await estimate_rows(session, froms[0].name)
+        if value is None:
+            value = await estimate_query_rows(session, query)
+        count = Count(value, CountMode.ESTIMATED)
+
+    LIST_COUNTS.set(key, count)
+    return count
+
+
+async def paginate(session: AsyncSession, query: Select, keys: tuple[InstrumentedAttribute, ...], first: int, after: str | None = None) -> Page:
+    """
+    Keyset pagination of `query` ordered by `keys` (unique together, last one the primary key).
+    Rows after the cursor are found with a row comparison, so an index on `keys` serves any page.
+    """
+    listed = query
+    if after is not None:
+        query = query.where(tuple_(*keys) > tuple_(*decode_cursor(after, keys)))
+
+    # one extra row tells whether there is a next page
+    rows = list(await session.scalars(query.order_by(*keys).limit(first + 1)))
+    items = rows[:first]
+
+    return Page(
+        items=items,
+        cursors=[encode_cursor(tuple(getattr(item, key.key) for key in keys)) for item in items],
+        has_next=len(rows) > first,
+        has_previous=after is not None,
+        count=partial(count_rows, session, listed),
+    )
@@ -0,0 +1,46 @@
+import time
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry
+
+DB_POOL_CONNECTIONS_METRIC = Gauge("db_pool_connections", "Database pool connections", labelnames=('pool', 'state'), multiprocess_mode="livesum")
+DB_POOL_LIMIT_METRIC = Gauge("db_pool_connections_limit", "Maximum connections of the pool (size plus overflow)", labelnames=('pool',), multiprocess_mode="livesum")
+DB_POOL_CHECKOUT_METRIC = Histogram(
+    "db_pool_checkout_seconds",
+    "Time to get a connection from the pool, including opening overflow connections",
+    labelnames=('pool',),
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+DB_POOL_TIMEOUTS_METRIC = Counter("db_pool_timeouts", "Checkouts that gave up waiting for a connection", labelnames=('pool',))
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """
+    Queue pool reporting checkout wait time, timeouts and usage.
+    The pool label is the engine `pool_logging_name`.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._label = self._orig_logging_name or "default"
+        DB_POOL_LIMIT_METRIC.labels(pool=self._label).set(self.size() + max(self._max_overflow, 0))
+
+    def _report(self):
+        DB_POOL_CONNECTIONS_METRIC.labels(pool=self._label, state="checked_out").set(self.checkedout())
+        DB_POOL_CONNECTIONS_METRIC.labels(pool=self._label, state="idle").set(self.checkedin())
+        DB_POOL_CONNECTIONS_METRIC.labels(pool=self._label, state="overflow").set(max(self.overflow(), 0))
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            DB_POOL_TIMEOUTS_METRIC.labels(pool=self._label).inc()
+            raise
+        finally:
+            DB_POOL_CHECKOUT_METRIC.labels(pool=self._label).observe(time.perf_counter() - start)
+            self._report()
+
+    def _do_return_conn(self, record: ConnectionPoolEntry):
+        super()._do_return_conn(record)
+        self._report()
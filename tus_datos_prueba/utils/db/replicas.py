@@ -0,0 +1,119 @@
+import random
+import time
+from prometheus_client import Gauge
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from tus_datos_prueba.utils.cache import TTLCache
+from tus_datos_prueba.utils.db.notify import subscribe
+from tus_datos_prueba.utils.db.pool import InstrumentedPool
+from tus_datos_prueba.config import (
+    POSTGRES_REPLICA_URIS,
+    IS_DEBUG,
+    DB_POOL_SIZE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_TIMEOUT,
+    DB_POOL_RECYCLE,
+    DB_POOL_PRE_PING,
+    DB_REPLICA_MAX_LAG,
+    DB_REPLICA_LAG_INTERVAL,
+    DB_REPLICA_STICKY_SECONDS,
+)
+
+DB_REPLICA_LAG_METRIC = Gauge("db_replica_lag_seconds", "Replication lag of each read replica", labelnames=('replica',), multiprocess_mode="livemostrecent")
+DB_REPLICA_UP_METRIC = Gauge("db_replica_up", "1 while the replica receives read only sessions", labelnames=('replica',), multiprocess_mode="livemin")
+
+# an idle primary sends no WAL, the replay timestamp only counts while there is WAL to replay.
+# Equal LSNs only mean "caught up" while streaming, a disconnected receiver freezes both.
+LAG_QUERY = text("""
+    SELECT
+        pg_is_in_recovery() AS in_recovery,
+        EXISTS (SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming') AS streaming,
+        CASE
+            WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+            ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+        END AS lag
+""")
+
+# payload is the user id, sent after a mutation so every worker reads its writes from the primary
+STICKY_CHANNEL = "replica_sticky"
+
+
+class Replica:
+    def __init__(self, name: str, engine: AsyncEngine):
+        self.name = name
+        self.engine = engine
+        self.lag: float | None = None
+        self.checked_at = 0.0
+
+    @property
+    def healthy(self) -> bool:
+        fresh = time.monotonic() - self.checked_at <= 3 * DB_REPLICA_LAG_INTERVAL
+        return fresh and self.lag is not None and self.lag <= DB_REPLICA_MAX_LAG
+
+
+__REPLICAS = [
+    Replica(f"replica{i}", create_async_engine(
+        uri,
+        echo=IS_DEBUG,
+        poolclass=InstrumentedPool,
+        pool_logging_name=f"replica{i}",
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING,
+    ))
+    for i, uri in enumerate(POSTGRES_REPLICA_URIS)
+]
+
+# user id -> reads go to the primary until the entry expires
+STICKY: TTLCache[str, bool] = TTLCache("replica_sticky", 10000, DB_REPLICA_STICKY_SECONDS)
+
+
+def _on_sticky(payload: str | None):
+    # nothing to do when notifications were missed, entries expire anyway
+    if payload is not None:
+        STICKY.set(payload, True)
+
+
+subscribe(STICKY_CHANNEL, _on_sticky)
+
+
+def has_replicas() -> bool:
+    return len(__REPLICAS) > 0
+
+
+def pick_replica() -> AsyncEngine | None:
+    """
+    A replica within the lag limit, None when reads must go to the primary
+    """
+    healthy = [replica for replica in __REPLICAS if replica.healthy]
+    return random.choice(healthy).engine if healthy else None
+
+
+def is_sticky(user_id: str) -> bool:
+    return STICKY.get(user_id) is not None
+
+
+async def probe_replicas():
+    for replica in __REPLICAS:
+        try:
+            async with AsyncSession(replica.engine) as session:
+                status = (await session.execute(LAG_QUERY)).one()
+
+            if not status.in_recovery:
+                print(f"Replica {replica.name} is not in recovery, it is not a replica")
+                replica.lag = None
+            elif not status.streaming:
+                print(f"Replica {replica.name} is not streaming from the primary")
+                replica.lag = None
+            else:
+                replica.lag = None if status.lag is None else float(status.lag)
+
+            if replica.lag is not None:
+                DB_REPLICA_LAG_METRIC.labels(replica=replica.name).set(replica.lag)
+        except Exception as err:
+            print(f"Replica {replica.name} probe failed: {err}")
+            replica.lag = None
+        replica.checked_at = time.monotonic()
+        DB_REPLICA_UP_METRIC.labels(replica=replica.name).set(1 if replica.healthy else 0)
@@ -0,0 +1,47 @@
+from sqlalchemy import Select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+_RELTUPLES = text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)")
+
+_ACTIVE_FRACTION = text("""
+    SELECT most_common_vals::text::boolean[] AS vals, most_common_freqs AS freqs, null_frac
+    FROM pg_stats
+    WHERE schemaname = current_schema() AND tablename = :table AND attname = :column
+""")
+
+
+async def estimate_rows(session: AsyncSession, table: str) -> int | None:
+    """
+    Planner row estimate of a table, None when the table was never analyzed
+    """
+    estimate = await session.scalar(_RELTUPLES, {"table": table})
+    if estimate is None or estimate < 0:
+        return None
+    return estimate
+
+
+async def estimate_true_fraction(session: AsyncSession, table: str, column: str) -> float | None:
+    """
+    Fraction of rows where a boolean column is true, taken from the planner statistics
+    """
+    row = (await session.execute(_ACTIVE_FRACTION, {"table": table, "column": column})).first()
+    if row is None or row.vals is None:
+        return None
+
+    for value, freq in zip(row.vals, row.freqs):
+        if value:
+            return freq
+
+    # `true` is not a most common value, every non null row left is `false`
+    return 0.0 if sum(row.freqs) + row.null_frac >= 0.999 else None
+
+
+async def estimate_query_rows(session: AsyncSession, query: Select) -> int:
+    """
+    Rows the planner expects `query` to return, from EXPLAIN (nothing is executed)
+    """
+    conn = await session.connection()
+    compiled = query.compile(dialect=conn.dialect)
+    result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params)
+    plan = result.scalar()
+    return int(plan[0]["Plan"]["Plan Rows"])
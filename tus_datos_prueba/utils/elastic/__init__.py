@@ -1,11 +1,40 @@
 from typing import Annotated
 from fastapi import Depends
 from elasticsearch import AsyncElasticsearch as ElasticClient
-from tus_datos_prueba.config import ELASTIC_HOSTS
+from tus_datos_prueba.config import (
+    ELASTIC_HOSTS,
+    ELASTIC_CONNECTIONS_PER_NODE,
+    ELASTIC_REQUEST_TIMEOUT,
+    ELASTIC_MAX_RETRIES,
+    ELASTIC_RETRY_ON_TIMEOUT,
+)
+
+# One client (and one aiohttp pool per node) for the whole worker
+__CLIENT: ElasticClient | None = None
+
+
+def open_elastic() -> ElasticClient:
+    global __CLIENT
+    if __CLIENT is None:
+        __CLIENT = ElasticClient(
+            hosts=ELASTIC_HOSTS,
+            connections_per_node=ELASTIC_CONNECTIONS_PER_NODE,
+            request_timeout=ELASTIC_REQUEST_TIMEOUT,
+            max_retries=ELASTIC_MAX_RETRIES,
+            retry_on_timeout=ELASTIC_RETRY_ON_TIMEOUT,
+        )
+    return __CLIENT
+
+
+async def close_elastic():
+    global __CLIENT
+    if __CLIENT is not None:
+        client, __CLIENT = __CLIENT, None
+        await client.close()
 
 
 async def get_elastic() -> ElasticClient:
-    return ElasticClient(hosts=ELASTIC_HOSTS)
+    return open_elastic()
 
 
-Elastic = Annotated[ElasticClient, Depends(get_elastic)]
\ No newline at end of file
+Elastic = Annotated[ElasticClient, Depends(get_elastic)]
@@ -0,0 +1,150 @@
+from datetime import datetime, timezone
+from sqlalchemy import func, select
+from tus_datos_prueba.models.events import Assistant, Event
+from tus_datos_prueba.utils.db import new_session
+from tus_datos_prueba.utils.elastic import ElasticClient
+from tus_datos_prueba.config import ELASTIC_REINDEX_BATCH_SIZE
+
+# searches and logstash use the alias, each reindex builds a new `events-<timestamp>` index behind it
+EVENTS_ALIAS = "events"
+EVENTS_TEMPLATE = "events"
+
+EVENTS_SETTINGS = {
+    "analysis": {
+        "filter": {
+            "events_spanish_stop": {"type": "stop", "stopwords": "_spanish_"},
+            "events_english_stop": {"type": "stop", "stopwords": "_english_"},
+            "events_spanish_stemmer": {"type": "stemmer", "language": "light_spanish"},
+        },
+        "analyzer": {
+            # events are written in spanish, sometimes in english
+            "events_text": {
+                "type": "custom",
+                "tokenizer": "standard",
+                "filter": ["lowercase", "asciifolding", "events_spanish_stop", "events_english_stop", "events_spanish_stemmer"],
+            },
+        },
+    },
+}
+
+_TEXT = {"type": "text", "analyzer": "events_text"}
+
+EVENTS_MAPPINGS = {
+    # fields added by logstash (@version, ...) stay in _source without being indexed
+    "dynamic": False,
+    "properties": {
+        "id": {"type": "keyword"},
+        "title": _TEXT,
+        "description": _TEXT,
+        "start_date": {"type": "date"},
+        "end_date": {"type": "date"},
+        "status": {"type": "keyword"},
+        "created_by_id": {"type": "keyword"},
+        "active": {"type": "boolean"},
+        "updated_at": {"type": "date"},
+        "assitant_limit": {"type": "integer"},
+        "assistant_count": {"type": "integer"},
+        "@timestamp": {"type": "date"},
+        # free form, only the searched keys are indexed
+        "metadata": {
+            "type": "object",
+            "dynamic": False,
+            "properties": {
+                "location": _TEXT,
+                "category": _TEXT,
+            },
+        },
+    },
+}
+
+
+def document_id(event_id) -> str:
+    # same id as the logstash pipeline, so its upserts land on the reindexed documents
+    return f"events_{event_id}"
+
+
+def event_document(event: Event, assistant_count: int) -> dict:
+    return {
+        "id": str(event.id),
+        "title": event.title,
+        "description": event.description,
+        "start_date": event.start_date.isoformat(),
+        "end_date": event.end_date.isoformat(),
+        "metadata": event.meta,
+        "assitant_limit": event.assitant_limit,
+        "status": event.status.name,
+        "created_by_id": str(event.created_by_id),
+        "active": event.active,
+        "updated_at": event.updated_at.isoformat() if event.updated_at else None,
+        "assistant_count": assistant_count,
+    }
+
+
+async def ensure_events_template(client: ElasticClient):
+    """
+    Install the events index template, it also covers an `events` index auto created by logstash before any reindex
+    """
+    await client.indices.put_index_template(
+        name=EVENTS_TEMPLATE,
+        index_patterns=[EVENTS_ALIAS, f"{EVENTS_ALIAS}-*"],
+        template={"settings": EVENTS_SETTINGS, "mappings": EVENTS_MAPPINGS},
+    )
+
+
+async def _bulk(client: ElasticClient, index: str, documents: list[dict]):
+    operations = list()
+    for document in documents:
+        operations.append({"index": {"_index": index, "_id": document_id(document["id"])}})
+        operations.append(document)
+
+    result = await client.bulk(operations=operations)
+    if result["errors"]:
+        failed = [item["index"] for item in result["items"] if "error" in item["index"]]
+        raise RuntimeError(f"{len(failed)} events were not indexed, first error: {failed[0]['error']}")
+
+
+async def reindex_events(client: ElasticClient, batch_size: int = ELASTIC_REINDEX_BATCH_SIZE) -> str:
+    """
+    Build a new events index from Postgres and move the alias to it in one atomic update.
+    Searches keep using the previous index until the swap; what logstash writes meanwhile
+    goes to the previous index and reaches the new one on the next pipeline run.
+    """
+    await ensure_events_template(client)
+
+    index = f"{EVENTS_ALIAS}-{datetime.now(timezone.utc):%Y%m%d%H%M%S}"
+    # no refreshes nor replicas while loading, both come back before the swap
+    await client.indices.create(index=index, settings={"refresh_interval": "-1", "number_of_replicas": 0})
+
+    query = (
+        select(Event, func.count(Assistant.id))
+        .outerjoin(Assistant, Assistant.event_id == Event.id)
+        .group_by(Event.id)
+        .execution_options(yield_per=batch_size)
+    )
+
+    total = 0
+    async with new_session() as session:
+        result = await session.stream(query)
+        async for rows in result.partitions():
+            await _bulk(client, index, [event_document(event, count) for event, count in rows])
+            total += len(rows)
+
+    await client.indices.put_settings(index=index, settings={"refresh_interval": None, "number_of_replicas": None})
+    await client.indices.refresh(index=index)
+
+    actions = [{"add": {"index": index, "alias": EVENTS_ALIAS, "is_write_index": True}}]
+    previous = list()
+    if await client.indices.exists_alias(name=EVENTS_ALIAS):
+        previous = list((await client.indices.get_alias(name=EVENTS_ALIAS)).keys())
+        actions += [{"remove": {"index": name, "alias": EVENTS_ALIAS}} for name in previous]
+    elif await client.indices.exists(index=EVENTS_ALIAS):
+        # a concrete index with the alias name, removed in the same update that creates the alias
+        actions.append({"remove_index": {"index": EVENTS_ALIAS}})
+
+    await client.indices.update_aliases(actions=actions)
+
+    for name in previous:
+        await client.indices.delete(index=name)
+
+    print(f"Indexed {total} events into {index}")
+    return index
@@ -0,0 +1,247 @@
+import asyncio
+import random
+from typing import Callable
+from prometheus_client import Counter, Gauge
+from tus_datos_prueba.utils.elastic import ElasticClient, open_elastic
+from tus_datos_prueba.utils.elastic.spool import Spool, Record, SPOOL_REPLAYED_METRIC
+from tus_datos_prueba.config import (
+    LOG_QUEUE_SIZE,
+    LOG_BATCH_SIZE,
+    LOG_FLUSH_INTERVAL,
+    LOG_OVERFLOW_POLICY,
+    LOG_SAMPLE_RATE,
+    LOG_SAMPLE_WATERMARK,
+    LOG_SPOOL_DIR,
+    LOG_SPOOL_SEGMENT_BYTES,
+    LOG_SPOOL_MAX_BYTES,
+)
+
+LOG_SHIPPED_METRIC = Counter("log_shipper_shipped", "Documents accepted by Elasticsearch", labelnames=('index',))
+LOG_DROPPED_METRIC = Counter("log_shipper_dropped", "Documents never shipped", labelnames=('index', 'reason'))
+LOG_QUEUE_DEPTH_METRIC = Gauge("log_shipper_queue_depth", "Documents waiting to be shipped", multiprocess_mode="livesum")
+LOG_ELASTIC_UP_METRIC = Gauge("log_shipper_elastic_up", "0 while logs are spooled to disk because Elasticsearch failed", multiprocess_mode="livemin")
+
+OVERFLOW_POLICIES = ("drop", "sample")
+
+# never sampled, spooled to disk when the queue is full
+CRITICAL_INDICES = ("http_errors",)
+
+
+class LogShipper:
+    """
+    Bounded in-process queue of documents shipped to Elasticsearch with the _bulk API.
+    `ship` never waits: under backpressure documents are dropped (or sampled) instead,
+    except those of `critical_indices`, which go straight to the spool.
+    When Elasticsearch fails the batches go to the spool until `replay` finds the cluster healthy.
+    """
+
+    def __init__(
+        self,
+        max_queue: int = LOG_QUEUE_SIZE,
+        batch_size: int = LOG_BATCH_SIZE,
+        flush_interval: float = LOG_FLUSH_INTERVAL,
+        overflow_policy: str = LOG_OVERFLOW_POLICY,
+        sample_rate: float = LOG_SAMPLE_RATE,
+        sample_watermark: float = LOG_SAMPLE_WATERMARK,
+        elastic: Callable[[], ElasticClient] = open_elastic,
+        spool: Spool | None = None,
+        critical_indices: tuple[str, ...] = CRITICAL_INDICES,
+    ):
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"unknown log overflow policy {overflow_policy}")
+
+        self.queue: asyncio.Queue[Record] = asyncio.Queue(maxsize=max_queue)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow_policy = overflow_policy
+        self.sample_rate = sample_rate
+        self.sample_above = int(max_queue * sample_watermark)
+        self.elastic = elastic
+        self.spool = spool
+        self.critical_indices = critical_indices
+        self.healthy = True
+        self._task: asyncio.Task | None = None
+        # set by `close`, `run` flushes the batch it holds and returns
+        self._stopping = asyncio.Event()
+
+    def ship(self, index: str, document: dict, id: str | None = None) -> bool:
+        critical = index in self.critical_indices
+
+        if not critical and self.overflow_policy == "sample" and self.queue.qsize() >= self.sample_above:
+            if random.random() >= self.sample_rate:
+                LOG_DROPPED_METRIC.labels(index=index, reason="sampled").inc()
+                return False
+
+        try:
+            self.queue.put_nowait((index, id, document))
+        except asyncio.QueueFull:
+            # a small blocking write, only for the rare documents that must not be lost
+            if critical and self.spool is not None and self.spool.append([(index, id, document)]):
+                return True
+            LOG_DROPPED_METRIC.labels(index=index, reason="full").inc()
+            return False
+
+        LOG_QUEUE_DEPTH_METRIC.set(self.queue.qsize())
+        return True
+
+    def start(self) -> asyncio.Task:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self.run(), name="log_shipper")
+        return self._task
+
+    async def close(self):
+        if self._task is not None:
+            # not cancelled: the records already taken from the queue would be lost
+            self._stopping.set()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+        # ship whatever is left before the client is closed
+        while not self.queue.empty():
+            await self.flush(self._take(self.batch_size))
+
+        if self.spool is not None:
+            await asyncio.to_thread(self.spool.seal)
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while (record := await self._get()) is not None:
+            batch = [record]
+            deadline = loop.time() + self.flush_interval
+
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0 or (record := await self._get(timeout)) is None:
+                    break
+                batch.append(record)
+
+            await self.flush(batch)
+
+    async def _get(self, timeout: float | None = None) -> Record | None:
+        """
+        Next queued record, None on timeout or once `close` was called
+        """
+        if self._stopping.is_set():
+            return None
+        if not self.queue.empty():
+            return self.queue.get_nowait()
+
+        get = asyncio.ensure_future(self.queue.get())
+        stop = asyncio.ensure_future(self._stopping.wait())
+        try:
+            await asyncio.wait((get, stop), timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            stop.cancel()
+            if not get.done():
+                get.cancel()
+
+        return get.result() if get.done() and not get.cancelled() else None
+
+    def _take(self, size: int) -> list[Record]:
+        batch = list()
+        while len(batch) < size and not self.queue.empty():
+            batch.append(self.queue.get_nowait())
+        return batch
+
+    async def flush(self, batch: list[Record]):
+        LOG_QUEUE_DEPTH_METRIC.set(self.queue.qsize())
+        if not batch:
+            return
+
+        if not self.healthy:
+            await self._spool(batch)
+            return
+
+        failed = await self._bulk(batch)
+        if failed:
+            await self._spool(failed)
+
+    async def _bulk(self, batch: list[Record]) -> list[Record]:
+        """
+        Send a batch, returns the records worth retrying later
+        """
+        operations = list()
+        for index, id, document in batch:
+            action = {"_index": index}
+            if id is not None:
+                action["_id"] = id
+            operations.append({"index": action})
+            operations.append(document)
+
+        try:
+            result = await self.elastic().bulk(operations=operations)
+        except Exception as err:
+            print(f"Failed to ship {len(batch)} logs to Elasticsearch: {err}")
+            self._set_healthy(False)
+            return batch
+
+        retry = list()
+        for record, item in zip(batch, result["items"]):
+            status = item["index"].get("status", 500)
+            if "error" not in item["index"]:
+                LOG_SHIPPED_METRIC.labels(index=record[0]).inc()
+            elif status == 429 or status >= 500:
+                retry.append(record)
+            else:
+                LOG_DROPPED_METRIC.labels(index=record[0], reason="rejected").inc()
+        return retry
+
+    async def _spool(self, batch: list[Record]):
+        if self.spool is None:
+            written = 0
+        else:
+            try:
+                written = await asyncio.to_thread(self.spool.append, batch)
+            except OSError as err:
+                print(f"Failed to spool {len(batch)} logs: {err}")
+                written = 0
+
+        if not written:
+            for index, _, _ in batch:
+                LOG_DROPPED_METRIC.labels(index=index, reason="error").inc()
+
+    def _set_healthy(self, healthy: bool):
+        self.healthy = healthy
+        LOG_ELASTIC_UP_METRIC.set(1 if healthy else 0)
+
+    async def replay(self):
+        """
+        Stream spooled segments back to Elasticsearch once the cluster is healthy
+        """
+        if self.spool is None:
+            return
+
+        try:
+            health = await self.elastic().cluster.health()
+        except Exception:
+            self._set_healthy(False)
+            return
+        if health["status"] == "red":
+            self._set_healthy(False)
+            return
+
+        self._set_healthy(True)
+        await asyncio.to_thread(self.spool.recover)
+        await asyncio.to_thread(self.spool.seal)
+
+        while (segment := await asyncio.to_thread(self.spool.claim)) is not None:
+            batches = await asyncio.to_thread(lambda: list(self.spool.read(segment, self.batch_size)))
+
+            for position, batch in enumerate(batches):
+                failed = await self._bulk(batch)
+                if not self.healthy:
+                    pending = [record for rest in batches[position + 1:] for record in rest]
+                    await asyncio.to_thread(self.spool.release, segment, failed + pending)
+                    return
+                if failed:
+                    await self._spool(failed)
+
+                retried = set(map(id, failed))
+                for record in batch:
+                    if id(record) not in retried:
+                        SPOOL_REPLAYED_METRIC.labels(index=record[0]).inc()
+
+            await asyncio.to_thread(self.spool.release, segment)
+
+
+LOG_SHIPPER = LogShipper(spool=Spool(LOG_SPOOL_DIR, LOG_SPOOL_SEGMENT_BYTES, LOG_SPOOL_MAX_BYTES))
@@ -0,0 +1,160 @@
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Iterator
+from prometheus_client import Counter, Gauge
+
+SPOOL_WRITTEN_METRIC = Counter("log_spool_written", "Documents written to the local spool", labelnames=('index',))
+SPOOL_REPLAYED_METRIC = Counter("log_spool_replayed", "Documents replayed from the local spool", labelnames=('index',))
+SPOOL_BYTES_METRIC = Gauge("log_spool_bytes", "Bytes waiting in the local spool", multiprocess_mode="livemostrecent")
+
+Record = tuple[str, str | None, dict]
+
+OPEN_SUFFIX = ".ndjson.open"
+SEALED_SUFFIX = ".ndjson"
+CLAIMED_SUFFIX = ".ndjson.replaying"
+
+
+class Spool:
+    """
+    Append-only NDJSON segments on disk, one record per line.
+    The active segment is rotated once it is over `segment_bytes`; only sealed
+    segments are replayed and a replayer claims them with an atomic rename,
+    so several workers can share the directory.
+    Methods do blocking IO, call them from a thread.
+    """
+
+    def __init__(self, directory: str, segment_bytes: int, max_bytes: int):
+        self.directory = Path(directory)
+        self.segment_bytes = segment_bytes
+        self.max_bytes = max_bytes
+        self._active: Path | None = None
+        self._active_size = 0
+        self._lock = threading.Lock()
+
+    def _new_segment(self, suffix: str) -> Path:
+        return self.directory / f"{time.time_ns()}-{os.getpid()}{suffix}"
+
+    def size(self) -> int:
+        if not self.directory.exists():
+            return 0
+        return sum(path.stat().st_size for path in self.directory.iterdir() if path.is_file())
+
+    def append(self, records: list[Record]) -> int:
+        """
+        Write records to the active segment, returns how many were written
+        """
+        payload = b"".join(_line(record) for record in records)
+
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+            spooled = self.size()
+            if spooled + len(payload) > self.max_bytes:
+                return 0
+
+            if self._active is None:
+                self._active = self._new_segment(OPEN_SUFFIX)
+                self._active_size = 0
+
+            with open(self._active, "ab") as segment:
+                segment.write(payload)
+            self._active_size += len(payload)
+
+            if self._active_size >= self.segment_bytes:
+                self._seal()
+
+        for index, _, _ in records:
+            SPOOL_WRITTEN_METRIC.labels(index=index).inc()
+        SPOOL_BYTES_METRIC.set(spooled + len(payload))
+        return len(records)
+
+    def seal(self):
+        with self._lock:
+            self._seal()
+
+    def _seal(self):
+        if self._active is not None:
+            self._active.rename(self._active.with_name(self._active.name.removesuffix(OPEN_SUFFIX) + SEALED_SUFFIX))
+            self._active = None
+            self._active_size = 0
+
+    def claim(self) -> Path | None:
+        """
+        Take the oldest sealed segment for replay, None when there is nothing to replay
+        """
+        if not self.directory.exists():
+            return None
+
+        for path in sorted(self.directory.glob(f"*{SEALED_SUFFIX}")):
+            claimed = path.with_name(f"{path.name.removesuffix(SEALED_SUFFIX)}~{os.getpid()}{CLAIMED_SUFFIX}")
+            try:
+                path.rename(claimed)
+            except FileNotFoundError:
+                # another worker got it first
+                continue
+            return claimed
+        return None
+
+    def read(self, segment: Path, batch_size: int) -> Iterator[list[Record]]:
+        batch = list()
+        with open(segment, "rb") as lines:
+            for line in lines:
+                record = json.loads(line)
+                batch.append((record["index"], record["id"], record["document"]))
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = list()
+        if batch:
+            yield batch
+
+    def release(self, segment: Path, pending: list[Record] | None = None):
+        """
+        Finish a claimed segment, records not replayed go back to a new sealed segment
+        """
+        if pending:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            # write aside and rename, other replayers must never see a partial segment
+            partial = self._new_segment(".ndjson.tmp")
+            with open(partial, "wb") as out:
+                out.write(b"".join(_line(record) for record in pending))
+            partial.rename(partial.with_name(partial.name.removesuffix(".ndjson.tmp") + SEALED_SUFFIX))
+        segment.unlink(missing_ok=True)
+        SPOOL_BYTES_METRIC.set(self.size())
+
+    def recover(self):
+        """
+        Seal segments left open or claimed by processes that are not running anymore
+        """
+        if not self.directory.exists():
+            return
+        for path in self.directory.iterdir():
+            if path.name.endswith(OPEN_SUFFIX):
+                stem = path.name.removesuffix(OPEN_SUFFIX)
+                owner = stem.rsplit("-", 1)[-1]
+            elif path.name.endswith(CLAIMED_SUFFIX):
+                stem, owner = path.name.removesuffix(CLAIMED_SUFFIX).rsplit("~", 1)
+            else:
+                continue
+
+            if path != self._active and not _is_running(int(owner)):
+                path.rename(path.with_name(stem + SEALED_SUFFIX))
+
+
+def _line(record: Record) -> bytes:
+    index, id, document = record
+    return (json.dumps({"index": index, "id": id, "document": document}, default=str) + "\n").encode("utf-8")
+
+
+def _is_running(pid: int) -> bool:
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
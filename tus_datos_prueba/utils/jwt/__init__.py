@@ -1,36 +1,73 @@
 from fastapi import HTTPException
 from tus_datos_prueba.models import User
-from tus_datos_prueba.config import SECRET
+from tus_datos_prueba.utils.cache import TTLCache
+from tus_datos_prueba.utils.jwt.perms import PermissionRegistry, get_registry
+from tus_datos_prueba.config import SECRET, TOKEN_CACHE_SIZE
 from jwt import encode, decode
 from datetime import datetime, timedelta, timezone
-from typing import TypedDict
+from hashlib import sha256
+from uuid import uuid4
+from typing import NotRequired, TypedDict
+
+SESSION_LIFETIME = timedelta(minutes=30)
 
 
 class UserPayload(TypedDict):
     sub: str
+    jti: str
     nbf: float
     exp: float
-    perms: dict[str, list[str]]
+    # full format
+    perms: NotRequired[dict[str, list[str]]]
+    # compact format: role id, role version, registry version and permission bitmask
+    rid: NotRequired[int]
+    rv: NotRequired[str]
+    pv: NotRequired[str]
+    pm: NotRequired[int]
 
 
-def sign_session(user: User) -> str:
+def sign_session(user: User, registry: PermissionRegistry | None = None) -> str:
+    """
+    With a registry the permissions are encoded as a bitmask (compact format)
+    """
     now = datetime.now(tz=timezone.utc)
-    expiration = now + timedelta(minutes=30)
+    expiration = now + SESSION_LIFETIME
 
     payload: UserPayload = {
         "sub": str(user.id),
+        "jti": uuid4().hex,
         "nbf": now.timestamp(),
         "exp": expiration.timestamp(),
-        "perms": user.role.permissions_dict,
     }
+
+    if registry is None:
+        payload["perms"] = user.role.permissions_dict
+    else:
+        payload["rid"] = user.role_id
+        payload["rv"] = user.role.version
+        payload["pv"] = registry.version
+        payload["pm"] = registry.encode(user.role.permissions_dict)
     
     return encode(payload, SECRET, algorithm="HS512")
 
+# token digest -> verified payload, entries expire with the token
+VERIFIED_TOKENS: TTLCache[bytes, UserPayload] = TTLCache("verified_tokens", TOKEN_CACHE_SIZE, SESSION_LIFETIME.total_seconds())
+
+
 def validate_session(jwt: str) -> UserPayload:
-    return decode(jwt, SECRET, algorithms=["HS512"])
+    key = sha256(jwt.encode()).digest()
+    payload = VERIFIED_TOKENS.get(key)
+    if payload is None:
+        payload = decode(jwt, SECRET, algorithms=["HS512"])
+        VERIFIED_TOKENS.set(key, payload, expires_at=payload["exp"])
+    return payload
 
 
 def has_permission(token: UserPayload, resource: str, verb: str) -> bool:
-    ok = resource in token["perms"] and verb in token["perms"][resource]
+    if "pm" in token:
+        registry = get_registry()
+        ok = registry is not None and registry.version == token["pv"] and registry.test(token["pm"], resource, verb)
+    else:
+        ok = resource in token["perms"] and verb in token["perms"][resource]
     if not ok:
         raise HTTPException(403, f"you does not have permission to {resource}.{verb}")
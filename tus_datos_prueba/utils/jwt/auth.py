@@ -2,12 +2,61 @@ from typing import Annotated
 from fastapi import Request, Depends, HTTPException
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from tus_datos_prueba.utils.db import Session
+from tus_datos_prueba.utils.db.notify import subscribe
+from tus_datos_prueba.utils.cache import TTLCache
 from tus_datos_prueba.utils.jwt import validate_session, UserPayload
+from tus_datos_prueba.utils.jwt.perms import get_registry, load_registry
+from tus_datos_prueba.utils.jwt.revocations import REVOCATIONS
 from tus_datos_prueba.models import User
-from sqlalchemy import select, func
+from tus_datos_prueba.config import AUTH_CACHE_SIZE, AUTH_CACHE_TTL
+from sqlalchemy import select
 from uuid import UUID
+import time
 from jwt.exceptions import PyJWTError
 
+# payload is the user id, sent when a user is deactivated or changed
+USER_CHANNEL = "user_changed"
+
+# user id -> (role id,), the role is None once the user is deactivated
+USER_LIVENESS: TTLCache[UUID, tuple[int | None]] = TTLCache("user_liveness", AUTH_CACHE_SIZE, AUTH_CACHE_TTL)
+
+# a token with an unknown registry version reloads the registry at most this often
+REGISTRY_RELOAD_INTERVAL = 1.0
+
+
+def _on_user_changed(payload: str | None):
+    if payload is None:
+        USER_LIVENESS.clear()
+    else:
+        USER_LIVENESS.pop(UUID(payload))
+
+
+subscribe(USER_CHANNEL, _on_user_changed)
+
+
+async def get_user_role(session: Session, user_id: UUID) -> int | None:
+    """
+    Role of the user, None when the user is not active
+    """
+    state = USER_LIVENESS.get(user_id)
+    if state is None:
+        state = (await session.scalar(select(User.role_id).where(User.id == user_id, User.active == True)),)
+        USER_LIVENESS.set(user_id, state)
+    return state[0]
+
+
+async def check_compact_session(session: Session, payload: UserPayload, role_id: int):
+    """
+    Compact tokens must be re-issued once the registry or the role permissions change
+    """
+    registry = get_registry()
+    if registry is None or (registry.version != payload["pv"] and time.monotonic() - registry.loaded_at > REGISTRY_RELOAD_INTERVAL):
+        registry = await load_registry(session)
+
+    if registry.version != payload["pv"] or payload["rid"] != role_id or registry.role_versions.get(role_id) != payload["rv"]:
+        raise HTTPException(401, "Permissions changed, sign in again")
+
+
 class JWTBearerAuth(HTTPBearer):
     def __init__(self):
         super().__init__(auto_error=True)
@@ -19,8 +68,15 @@ class JWTBearerAuth(HTTPBearer):
         except PyJWTError as err:
             raise HTTPException(401, f"Error initializing session: {str(err)}")
         else:
-            count = await session.scalar(select(func.count(User.id)).where(User.id == UUID(payload["sub"]), User.active == True))
-            assert count == 1
+            # tokens signed before jti was added can not be revoked
+            if "jti" in payload and await REVOCATIONS.is_revoked(session, payload["jti"]):
+                raise HTTPException(401, "Session revoked")
+
+            role_id = await get_user_role(session, UUID(payload["sub"]))
+            assert role_id is not None
+
+            if "pm" in payload:
+                await check_compact_session(session, payload, role_id)
 
             return payload
 
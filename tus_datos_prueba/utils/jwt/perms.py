@@ -0,0 +1,58 @@
+import json
+import time
+from hashlib import sha256
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from tus_datos_prueba.models import RolePerm
+from tus_datos_prueba.utils.db import new_session
+from tus_datos_prueba.models.roles import permissions_version
+
+
+class PermissionRegistry:
+    """
+    Every known (resource, verb) pair gets a bit, tokens carry the bitmask of their role.
+    The version changes when pairs are added or removed, which reassigns the bits.
+    """
+
+    def __init__(self, roles: dict[int, dict[str, list[str]]]):
+        pairs = {(resource, verb) for perms in roles.values() for resource, verbs in perms.items() for verb in verbs}
+        self.pairs = sorted(pairs)
+        self.bits = {pair: bit for bit, pair in enumerate(self.pairs)}
+        self.version = sha256(json.dumps(self.pairs).encode()).hexdigest()[:12]
+
+        self.role_versions = {role_id: permissions_version(perms) for role_id, perms in roles.items()}
+        self.loaded_at = time.monotonic()
+
+    def encode(self, perms: dict[str, list[str]]) -> int:
+        mask = 0
+        for resource, verbs in perms.items():
+            for verb in verbs:
+                mask |= 1 << self.bits[(resource, verb)]
+        return mask
+
+    def test(self, mask: int, resource: str, verb: str) -> bool:
+        bit = self.bits.get((resource, verb))
+        return bit is not None and mask >> bit & 1 == 1
+
+
+__REGISTRY: PermissionRegistry | None = None
+
+
+def get_registry() -> PermissionRegistry | None:
+    return __REGISTRY
+
+
+async def load_registry(session: AsyncSession) -> PermissionRegistry:
+    global __REGISTRY
+
+    roles: dict[int, dict[str, list[str]]] = dict()
+    for role_id, resource, verbs in await session.execute(select(RolePerm.role_id, RolePerm.resource, RolePerm.verbs)):
+        roles.setdefault(role_id, dict())[resource] = verbs
+
+    __REGISTRY = PermissionRegistry(roles)
+    return __REGISTRY
+
+
+async def refresh_registry():
+    async with new_session() as session:
+        await load_registry(session)
@@ -0,0 +1,110 @@
+from datetime import datetime, timedelta, timezone
+from prometheus_client import Counter
+from sqlalchemy import select, exists, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from tus_datos_prueba.models.tokens import RevokedToken
+from tus_datos_prueba.utils.bloom import BloomFilter
+from tus_datos_prueba.utils.db import new_session
+from tus_datos_prueba.utils.db.notify import notify, subscribe
+from tus_datos_prueba.config import REVOCATION_BLOOM_CAPACITY, REVOCATION_BLOOM_ERROR_RATE
+
+REVOCATION_CHECKS_METRIC = Counter("token_revocation_checks", "Revocation checks of access tokens", labelnames=('result',))
+
+# payload is the revoked jti
+REVOCATION_CHANNEL = "token_revoked"
+
+# rows committed late can carry an older created_at than the last one loaded
+OVERLAP = timedelta(seconds=30)
+
+
+class RevocationList:
+    """
+    Bloom filter of revoked jtis kept by every worker. New revocations are added
+    from NOTIFY and from incremental loads; a jti in the filter is confirmed in the database.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.bloom = BloomFilter(capacity, error_rate)
+        self.loaded_until: datetime | None = None
+        # while stale every check goes to the database
+        self.stale = True
+        # added during a refresh, copied to the rebuilt filter
+        self._recent: list[str] = list()
+        self._resets = 0
+
+    def add(self, jti: str):
+        self.bloom.add(jti)
+        self._recent.append(jti)
+
+    def _on_revoked(self, payload: str | None):
+        if payload is None:
+            # notifications may have been missed while the listener was down
+            self.stale = True
+            self._resets += 1
+        else:
+            self.add(payload)
+
+    async def refresh(self, session: AsyncSession):
+        """
+        Load revocations created since the last refresh, the filter is rebuilt
+        when it is stale or over capacity (expired revocations are dropped then)
+        """
+        now = datetime.now(tz=timezone.utc)
+        query = select(RevokedToken.jti, RevokedToken.created_at).where(RevokedToken.expires_at > now)
+
+        self._recent = list()
+        resets = self._resets
+
+        if self.stale or self.bloom.count >= self.bloom.capacity:
+            live = await session.scalar(select(func.count()).select_from(RevokedToken).where(RevokedToken.expires_at > now))
+            bloom = BloomFilter(max(self.capacity, live * 2), self.error_rate)
+        else:
+            bloom = self.bloom
+            query = query.where(RevokedToken.created_at > self.loaded_until - OVERLAP)
+
+        loaded_until = self.loaded_until
+        for jti, created_at in await session.execute(query):
+            bloom.add(jti)
+            if loaded_until is None or created_at > loaded_until:
+                loaded_until = created_at
+
+        for jti in self._recent:
+            bloom.add(jti)
+
+        self.bloom = bloom
+        self.loaded_until = loaded_until or now
+        # a reconnect during the load keeps it stale
+        if self._resets == resets:
+            self.stale = False
+
+    async def is_revoked(self, session: AsyncSession, jti: str) -> bool:
+        if not self.stale and jti not in self.bloom:
+            REVOCATION_CHECKS_METRIC.labels(result="filtered").inc()
+            return False
+
+        revoked = await session.scalar(select(exists().where(RevokedToken.jti == jti)))
+        REVOCATION_CHECKS_METRIC.labels(result="revoked" if revoked else "not_revoked").inc()
+        return revoked
+
+    async def revoke(self, session: AsyncSession, jti: str, expires_at: float):
+        # a retried logout sends the same token again
+        await session.execute(
+            insert(RevokedToken)
+            .values(jti=jti, expires_at=datetime.fromtimestamp(expires_at, tz=timezone.utc))
+            .on_conflict_do_nothing(index_elements=["jti"])
+        )
+        await notify(session, REVOCATION_CHANNEL, jti)
+        await session.commit()
+        self.add(jti)
+
+
+REVOCATIONS = RevocationList(REVOCATION_BLOOM_CAPACITY, REVOCATION_BLOOM_ERROR_RATE)
+subscribe(REVOCATION_CHANNEL, REVOCATIONS._on_revoked)
+
+
+async def refresh_revocations():
+    async with new_session() as session:
+        await REVOCATIONS.refresh(session)
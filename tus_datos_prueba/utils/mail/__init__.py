@@ -1,15 +1,55 @@
 from fastapi import Depends
 from typing import Annotated
-from aiosmtplib import SMTP
-from tus_datos_prueba.config import MAIL_HOST, MAIL_USER, MAIL_PASSWORD, MAIL_FROM, MAIL_TLS
+from email.message import Message
+from aiosmtplib import SMTP, SMTPServerDisconnected
+from tus_datos_prueba.utils.mail.pool import SMTPPool
+from tus_datos_prueba.config import (
+    MAIL_HOST,
+    MAIL_USER,
+    MAIL_PASSWORD,
+    MAIL_FROM,
+    MAIL_TLS,
+    MAIL_TIMEOUT,
+    MAIL_POOL_MIN_SIZE,
+    MAIL_POOL_MAX_SIZE,
+    MAIL_POOL_IDLE_TIMEOUT,
+)
 
 
-async def get_client() -> SMTP:
+async def connect() -> SMTP:
     host, port = MAIL_HOST.split(':')
-    mail = SMTP(hostname=host, port=port, username=MAIL_USER, password=MAIL_PASSWORD, start_tls=MAIL_TLS)
+    mail = SMTP(hostname=host, port=port, username=MAIL_USER, password=MAIL_PASSWORD, start_tls=MAIL_TLS, timeout=MAIL_TIMEOUT)
     await mail.connect()
-    yield mail
-    mail.close()
+    return mail
 
 
-Mail = Annotated[SMTP, Depends(get_client)]
\ No newline at end of file
+__POOL = SMTPPool(connect, MAIL_POOL_MIN_SIZE, MAIL_POOL_MAX_SIZE, MAIL_POOL_IDLE_TIMEOUT)
+
+
+def get_pool() -> SMTPPool:
+    return __POOL
+
+
+class MailClient:
+    """
+    Takes a pooled connection only while a message is being sent
+    """
+
+    def __init__(self, pool: SMTPPool):
+        self.pool = pool
+
+    async def send_message(self, message: Message):
+        try:
+            async with self.pool.connection() as mail:
+                return await mail.send_message(message)
+        except SMTPServerDisconnected:
+            # the server may drop a connection between NOOP and the send, retry on a new one
+            async with self.pool.connection() as mail:
+                return await mail.send_message(message)
+
+
+async def get_client() -> MailClient:
+    return MailClient(__POOL)
+
+
+Mail = Annotated[MailClient, Depends(get_client)]
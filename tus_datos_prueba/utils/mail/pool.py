@@ -0,0 +1,139 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable
+from aiosmtplib import SMTP, SMTPException
+from prometheus_client import Counter, Gauge
+
+SMTP_POOL_CONNECTIONS_METRIC = Gauge("smtp_pool_connections", "Open SMTP connections", labelnames=('state',), multiprocess_mode="livesum")
+SMTP_POOL_WAITING_METRIC = Gauge("smtp_pool_waiting", "Checkouts waiting for a free SMTP connection", multiprocess_mode="livesum")
+SMTP_POOL_LIMIT_METRIC = Gauge("smtp_pool_connections_limit", "Maximum SMTP connections of the pool", multiprocess_mode="livesum")
+SMTP_POOL_OPENED_METRIC = Counter("smtp_pool_opened", "SMTP connections opened")
+SMTP_POOL_DISCARDED_METRIC = Counter("smtp_pool_discarded", "SMTP connections closed by the pool", labelnames=('reason',))
+
+
+class SMTPPool:
+    """
+    Reusable SMTP connections (connect, EHLO, STARTTLS and AUTH done once).
+    Idle connections are checked with NOOP before reuse and closed after `idle_timeout`.
+    """
+
+    def __init__(self, factory: Callable[[], Awaitable[SMTP]], min_size: int, max_size: int, idle_timeout: float):
+        self.factory = factory
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+
+        self._idle: deque[tuple[SMTP, float]] = deque()
+        self._slots = asyncio.Semaphore(max_size)
+        self._in_use = 0
+        self._waiting = 0
+        SMTP_POOL_LIMIT_METRIC.set(max_size)
+
+    def _report(self):
+        SMTP_POOL_CONNECTIONS_METRIC.labels(state="in_use").set(self._in_use)
+        SMTP_POOL_CONNECTIONS_METRIC.labels(state="idle").set(len(self._idle))
+        SMTP_POOL_WAITING_METRIC.set(self._waiting)
+
+    async def _open(self) -> SMTP:
+        conn = await self.factory()
+        SMTP_POOL_OPENED_METRIC.inc()
+        return conn
+
+    async def _discard(self, conn: SMTP, reason: str, quit: bool = True):
+        SMTP_POOL_DISCARDED_METRIC.labels(reason=reason).inc()
+        if not quit:
+            conn.close()
+            return
+        try:
+            await conn.quit()
+        except Exception:
+            conn.close()
+
+    async def fill(self):
+        """
+        Open connections up to `min_size`
+        """
+        while len(self._idle) + self._in_use < self.min_size:
+            self._idle.append((await self._open(), time.monotonic()))
+        self._report()
+
+    async def acquire(self) -> SMTP:
+        self._waiting += 1
+        self._report()
+        try:
+            await self._slots.acquire()
+        finally:
+            self._waiting -= 1
+
+        conn = candidate = None
+        try:
+            while self._idle:
+                candidate, _ = self._idle.pop()
+                try:
+                    await candidate.noop()
+                except (SMTPException, OSError):
+                    await self._discard(candidate, "unhealthy")
+                    candidate = None
+                else:
+                    conn = candidate
+                    break
+
+            if conn is None:
+                conn = await self._open()
+        except BaseException:
+            # cancelled while checking an idle connection, it is no longer in the pool
+            if candidate is not None and conn is None:
+                SMTP_POOL_DISCARDED_METRIC.labels(reason="cancelled").inc()
+                candidate.close()
+            self._slots.release()
+            self._report()
+            raise
+
+        self._in_use += 1
+        self._report()
+        return conn
+
+    async def release(self, conn: SMTP, discard: bool = False):
+        self._in_use -= 1
+        if discard or not conn.is_connected:
+            # a discarded connection may be halfway through a command, even DATA, so no QUIT is sent
+            await self._discard(conn, "broken", quit=not discard)
+        else:
+            self._idle.append((conn, time.monotonic()))
+        self._slots.release()
+        self._report()
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[SMTP]:
+        conn = await self.acquire()
+        try:
+            yield conn
+        except BaseException:
+            # errors, timeouts and cancellations leave the connection in an unknown state
+            await self.release(conn, discard=True)
+            raise
+        else:
+            await self.release(conn)
+
+    async def reap(self):
+        """
+        Close connections idle for longer than `idle_timeout`, keeping `min_size` open
+        """
+        now = time.monotonic()
+        keep = deque()
+        while self._idle:
+            conn, last_used = self._idle.popleft()
+            if now - last_used > self.idle_timeout and len(keep) + len(self._idle) + self._in_use >= self.min_size:
+                await self._discard(conn, "idle")
+            else:
+                keep.append((conn, last_used))
+        self._idle.extendleft(reversed(keep))
+        self._report()
+
+    async def close(self):
+        while self._idle:
+            conn, _ = self._idle.popleft()
+            await self._discard(conn, "closed")
+        self._report()
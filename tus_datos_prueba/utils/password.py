@@ -1,4 +1,14 @@
+import asyncio
 import bcrypt
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+from prometheus_client import Gauge
+from tus_datos_prueba.config import PASSWORD_EXECUTOR, PASSWORD_WORKERS, PASSWORD_MAX_CONCURRENCY
+
+PASSWORD_WAITING_METRIC = Gauge("password_hash_waiting", "Password hash/verify calls waiting for a worker", multiprocess_mode="livesum")
+PASSWORD_RUNNING_METRIC = Gauge("password_hash_running", "Password hash/verify calls running", multiprocess_mode="livesum")
+
+__EXECUTOR: Executor | None = None
+__LIMIT = asyncio.Semaphore(PASSWORD_MAX_CONCURRENCY)
 
 def create_password(text: str) -> bytes:
     password_bytes = text.encode('utf-8')
@@ -11,3 +21,39 @@ def verify_password(password: str, hashed_password: bytes) -> bool:
     password_bytes = password.encode('utf-8')
     
     return bcrypt.checkpw(password_bytes, hashed_password)
+
+def get_executor() -> Executor:
+    global __EXECUTOR
+    if __EXECUTOR is None:
+        if PASSWORD_EXECUTOR == "process":
+            __EXECUTOR = ProcessPoolExecutor(max_workers=PASSWORD_WORKERS)
+        else:
+            __EXECUTOR = ThreadPoolExecutor(max_workers=PASSWORD_WORKERS, thread_name_prefix="bcrypt")
+    return __EXECUTOR
+
+def close_executor():
+    global __EXECUTOR
+    if __EXECUTOR is not None:
+        __EXECUTOR.shutdown(wait=False, cancel_futures=True)
+        __EXECUTOR = None
+
+async def _run(fn, *args):
+    # bcrypt takes ~100-300ms of CPU, keep it out of the event loop
+    PASSWORD_WAITING_METRIC.inc()
+    try:
+        await __LIMIT.acquire()
+    finally:
+        PASSWORD_WAITING_METRIC.dec()
+
+    PASSWORD_RUNNING_METRIC.inc()
+    try:
+        return await asyncio.get_running_loop().run_in_executor(get_executor(), fn, *args)
+    finally:
+        PASSWORD_RUNNING_METRIC.dec()
+        __LIMIT.release()
+
+async def create_password_async(text: str) -> bytes:
+    return await _run(create_password, text)
+
+async def verify_password_async(password: str, hashed_password: bytes) -> bool:
+    return await _run(verify_password, password, hashed_password)
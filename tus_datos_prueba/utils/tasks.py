@@ -0,0 +1,44 @@
+import asyncio
+from typing import Awaitable, Callable, Coroutine
+
+_TASKS: set[asyncio.Task] = set()
+
+
+def spawn(coro: Coroutine, name: str | None = None) -> asyncio.Task:
+    """
+    Start a background task tied to the app lifecycle, it is cancelled on shutdown
+    """
+    task = asyncio.get_running_loop().create_task(coro, name=name)
+    _TASKS.add(task)
+    task.add_done_callback(_done)
+    return task
+
+
+def _done(task: asyncio.Task):
+    _TASKS.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        print(f"Background task {task.get_name()} failed: {task.exception()}")
+
+
+def every(interval: float, fn: Callable[[], Awaitable[None]], name: str | None = None) -> asyncio.Task:
+    """
+    Run `fn` each `interval` seconds in background, errors are reported and the loop keeps going
+    """
+    async def loop():
+        while True:
+            try:
+                await fn()
+            except asyncio.CancelledError:
+                raise
+            except Exception as err:
+                print(f"Background task {name or fn.__name__} failed: {err}")
+            await asyncio.sleep(interval)
+
+    return spawn(loop(), name)
+
+
+async def cancel_all():
+    tasks = list(_TASKS)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
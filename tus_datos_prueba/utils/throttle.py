@@ -0,0 +1,59 @@
+import time
+from collections import OrderedDict
+from prometheus_client import Counter
+
+THROTTLE_REJECTED_METRIC = Counter("throttle_rejected", "Requests rejected by a token bucket limiter", labelnames=('limiter',))
+
+
+class TokenBucket:
+    """
+    Token bucket per key: `burst` tokens, refilled at `rate` tokens per second.
+    Only the least recently used `maxsize` keys are kept, a forgotten key starts full again.
+    """
+
+    def __init__(self, name: str, burst: float, rate: float, maxsize: int):
+        self.name = name
+        self.burst = burst
+        self.rate = rate
+        self.maxsize = maxsize
+        # key -> (tokens, last update)
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._rejected = THROTTLE_REJECTED_METRIC.labels(limiter=name)
+
+    def _tokens(self, key: str, now: float) -> float:
+        tokens, updated = self._buckets.get(key, (self.burst, now))
+        return min(self.burst, tokens + (now - updated) * self.rate)
+
+    def _store(self, key: str, tokens: float, now: float):
+        if tokens >= self.burst:
+            # a full bucket is the default, no need to keep it
+            self._buckets.pop(key, None)
+            return
+
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.maxsize:
+            self._buckets.popitem(last=False)
+
+    def acquire(self, key: str) -> bool:
+        """
+        Take a token, False (and nothing taken) when the bucket is empty
+        """
+        now = time.monotonic()
+        tokens = self._tokens(key, now)
+        if tokens < 1:
+            self._rejected.inc()
+            return False
+
+        self._store(key, tokens - 1, now)
+        return True
+
+    def refund(self, key: str):
+        now = time.monotonic()
+        self._store(key, min(self.burst, self._tokens(key, now) + 1), now)
+
+    def retry_after(self, key: str) -> float:
+        """
+        Seconds until the next token is available
+        """
+        return max(0.0, (1 - self._tokens(key, time.monotonic())) / self.rate)